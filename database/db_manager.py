@@ -9,11 +9,22 @@ Date: 2025
 
 import sqlite3
 import hashlib
+import queue
+import threading
+import atexit
 from pathlib import Path
 from datetime import datetime
 from contextlib import contextmanager
 import json
+import os
+import time
 import logging
+import itertools
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, only our own leftovers are replayed
+    fcntl = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,28 +34,269 @@ logger = logging.getLogger(__name__)
 DB_PATH = Path(__file__).parent / "hsu_database.db"
 SCHEMA_PATH = Path(__file__).parent / "schema.sql"
 
+# Connection pool settings
+POOL_SIZE = 8
+STATEMENT_CACHE_SIZE = 256   # Prepared statements kept per pooled connection
+STUDENT_USER_ID_CACHE_SIZE = 4096
+CONNECTION_PRAGMAS = [
+    "PRAGMA foreign_keys = ON",     # Enable foreign keys
+    "PRAGMA journal_mode = WAL",    # Readers don't block the writer
+    "PRAGMA synchronous = NORMAL",  # Safe with WAL, far fewer fsyncs
+    "PRAGMA cache_size = -20000",   # ~20 MB page cache per connection
+    "PRAGMA temp_store = MEMORY",   # Sorts/temp B-trees stay off disk
+]
+
+# Audit write buffer: log_action queues rows and a background thread
+# flushes them every AUDIT_FLUSH_INTERVAL seconds (or sooner once
+# AUDIT_BATCH_SIZE rows are waiting) in a single executemany
+AUDIT_FLUSH_INTERVAL = 0.1
+AUDIT_BATCH_SIZE = 100
+
+# Buffered audit rows are also appended to a journal file next to the
+# database (fsynced every AUDIT_FSYNC_EVERY rows) so a crash before the
+# flush doesn't lose them. Each DatabaseManager writes its own journal and
+# holds an exclusive lock on a matching .lock file while alive; on startup,
+# journals whose lock can be taken belonged to a dead process and are replayed
+AUDIT_JOURNAL_SUFFIX = "-audit.wal"
+AUDIT_FSYNC_EVERY = 100
+
+# Incremental schema changes for databases created from an older schema.sql.
+# Each entry is (version, statements); applied in order and recorded in
+# PRAGMA user_version so every step runs once per database file.
+MIGRATIONS = [
+    (1, [
+        "CREATE INDEX IF NOT EXISTS idx_risk_scores_current_student ON risk_scores(is_current, student_id)",
+        "CREATE INDEX IF NOT EXISTS idx_enrollments_student ON enrollments(student_id)",
+        "CREATE INDEX IF NOT EXISTS idx_grades_enrollment ON grades(enrollment_id)",
+        "CREATE INDEX IF NOT EXISTS idx_attendance_enrollment ON attendance(enrollment_id)",
+        "CREATE INDEX IF NOT EXISTS idx_notifications_user_unread ON notifications(user_id, is_read)",
+    ]),
+    (2, [
+        """
+        CREATE VIEW IF NOT EXISTS v_student_overview AS
+        SELECT
+            s.student_id,
+            s.user_id,
+            s.banner_id,
+            s.first_name,
+            s.last_name,
+            s.email,
+            s.classification,
+            s.enrollment_status,
+            s.first_generation_student,
+            s.international_student,
+            s.primary_advisor_id,
+            rs.overall_risk_score,
+            rs.academic_risk_factor,
+            rs.engagement_risk_factor,
+            rs.financial_risk_factor,
+            rs.wellness_risk_factor,
+            rs.risk_category,
+            rs.risk_pathway,
+            (SELECT AVG(g.grade_percentage)
+             FROM grades g
+             JOIN enrollments e ON g.enrollment_id = e.enrollment_id
+             WHERE e.student_id = s.student_id) AS avg_grade,
+            (SELECT i.title
+             FROM interventions i
+             WHERE i.student_id = s.student_id
+             ORDER BY i.created_at DESC, i.intervention_id DESC
+             LIMIT 1) AS latest_intervention_title,
+            (SELECT i.status
+             FROM interventions i
+             WHERE i.student_id = s.student_id
+             ORDER BY i.created_at DESC, i.intervention_id DESC
+             LIMIT 1) AS latest_intervention_status,
+            (SELECT COUNT(*)
+             FROM notifications n
+             WHERE n.user_id = s.user_id AND n.is_read = 0) AS unread_notifications
+        FROM students s
+        LEFT JOIN risk_scores rs ON rs.student_id = s.student_id AND rs.is_current = 1
+        """,
+    ]),
+    (3, [
+        "DROP INDEX IF EXISTS idx_notifications_user_unread",
+        "CREATE INDEX IF NOT EXISTS idx_notifications_user_unread ON notifications(user_id, is_read, created_at DESC)",
+    ]),
+    (4, [
+        "CREATE INDEX IF NOT EXISTS idx_interventions_advisor_date ON interventions(advisor_id, scheduled_date DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_interventions_student_date ON interventions(student_id, scheduled_date DESC)",
+    ]),
+    (5, [
+        "CREATE INDEX IF NOT EXISTS idx_email_queue_pending ON email_queue(status, priority DESC, created_at) WHERE status = 'Pending'",
+    ]),
+    (6, [
+        "ALTER TABLE email_queue ADD COLUMN dedup_key TEXT",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_email_queue_dedup ON email_queue(dedup_key) WHERE status IN ('Pending', 'Sending') AND retry_count < 3",
+    ]),
+    (7, [
+        "CREATE INDEX IF NOT EXISTS idx_interventions_status_advisor ON interventions(status, advisor_id, scheduled_date)",
+        "CREATE INDEX IF NOT EXISTS idx_interventions_overdue ON interventions(advisor_id, scheduled_date) WHERE status = 'Scheduled'",
+        "CREATE INDEX IF NOT EXISTS idx_interventions_followup ON interventions(follow_up_date) WHERE follow_up_required = 1 AND status = 'Completed'",
+    ]),
+    (8, [
+        "CREATE INDEX IF NOT EXISTS idx_interventions_overdue_date ON interventions(scheduled_date) WHERE status = 'Scheduled'",
+    ]),
+    (9, [
+        "CREATE INDEX IF NOT EXISTS idx_interventions_created ON interventions(created_at)",
+    ]),
+    # Current risk denormalized onto students, kept in step by triggers
+    (10, [
+        "ALTER TABLE students ADD COLUMN current_risk_score REAL",
+        "ALTER TABLE students ADD COLUMN current_risk_category VARCHAR(50)",
+        """
+        UPDATE students SET
+            current_risk_score = (
+                SELECT rs.overall_risk_score FROM risk_scores rs
+                WHERE rs.student_id = students.student_id AND rs.is_current = 1
+                ORDER BY rs.score_calculation_date DESC LIMIT 1
+            ),
+            current_risk_category = (
+                SELECT rs.risk_category FROM risk_scores rs
+                WHERE rs.student_id = students.student_id AND rs.is_current = 1
+                ORDER BY rs.score_calculation_date DESC LIMIT 1
+            )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_risk_scores_current_insert
+        AFTER INSERT ON risk_scores WHEN NEW.is_current = 1
+        BEGIN
+            UPDATE students
+            SET current_risk_score = NEW.overall_risk_score,
+                current_risk_category = NEW.risk_category
+            WHERE student_id = NEW.student_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_risk_scores_current_update
+        AFTER UPDATE OF is_current, overall_risk_score, risk_category ON risk_scores
+        WHEN NEW.is_current = 1
+        BEGIN
+            UPDATE students
+            SET current_risk_score = NEW.overall_risk_score,
+                current_risk_category = NEW.risk_category
+            WHERE student_id = NEW.student_id;
+        END
+        """,
+    ]),
+    # Intervention type name/category denormalized onto interventions
+    (11, [
+        "ALTER TABLE interventions ADD COLUMN type_name VARCHAR(200)",
+        "ALTER TABLE interventions ADD COLUMN type_category VARCHAR(100)",
+        """
+        UPDATE interventions SET
+            type_name = (SELECT it.type_name FROM intervention_types it
+                         WHERE it.intervention_type_id = interventions.intervention_type_id),
+            type_category = (SELECT it.category FROM intervention_types it
+                             WHERE it.intervention_type_id = interventions.intervention_type_id)
+        WHERE intervention_type_id IS NOT NULL
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_interventions_type ON interventions(type_category, type_name)",
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_interventions_type_insert
+        AFTER INSERT ON interventions WHEN NEW.intervention_type_id IS NOT NULL
+        BEGIN
+            UPDATE interventions
+            SET type_name = (SELECT type_name FROM intervention_types
+                             WHERE intervention_type_id = NEW.intervention_type_id),
+                type_category = (SELECT category FROM intervention_types
+                                 WHERE intervention_type_id = NEW.intervention_type_id)
+            WHERE intervention_id = NEW.intervention_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_interventions_type_update
+        AFTER UPDATE OF intervention_type_id ON interventions
+        BEGIN
+            UPDATE interventions
+            SET type_name = (SELECT type_name FROM intervention_types
+                             WHERE intervention_type_id = NEW.intervention_type_id),
+                type_category = (SELECT category FROM intervention_types
+                                 WHERE intervention_type_id = NEW.intervention_type_id)
+            WHERE intervention_id = NEW.intervention_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_intervention_types_rename
+        AFTER UPDATE OF type_name, category ON intervention_types
+        BEGIN
+            UPDATE interventions
+            SET type_name = NEW.type_name, type_category = NEW.category
+            WHERE intervention_type_id = NEW.intervention_type_id;
+        END
+        """,
+    ]),
+    # When process_email_queue claimed a row, so abandoned claims can be reset
+    (12, [
+        "ALTER TABLE email_queue ADD COLUMN claimed_at TIMESTAMP",
+        "CREATE INDEX IF NOT EXISTS idx_email_queue_claimed ON email_queue(claimed_at) WHERE status = 'Sending'",
+    ]),
+]
+
+
+_journal_ids = itertools.count()
+
 
 class DatabaseManager:
     """Manages all database operations for HSU Early Warning System"""
     
-    def __init__(self, db_path=DB_PATH):
+    def __init__(self, db_path=DB_PATH, pool_size=POOL_SIZE):
         """Initialize database manager"""
         self.db_path = db_path
+        self._pool = queue.Queue(maxsize=pool_size)
+        self._audit_buf = []
+        self._audit_lock = threading.Lock()
+        self._audit_wakeup = threading.Event()
+        self._audit_thread = None
+        journal_base = f"{db_path}{AUDIT_JOURNAL_SUFFIX}-{os.getpid()}-{next(_journal_ids)}"
+        self._audit_journal_path = Path(journal_base)
+        self._audit_owner_path = Path(f"{journal_base}.lock")
+        self._audit_owner = None
+        self._audit_journal = None
+        self._audit_unsynced = 0
+        self._audit_segments = []
+        self._student_user_ids = {}
         self.ensure_database_exists()
+        self._claim_audit_journal()
+        self._replay_audit_journals()
+    
+    def _connect(self):
+        """Open a new configured connection"""
+        # Connections are handed between Streamlit session threads via the pool
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _acquire_connection(self):
+        """Take an idle connection from the pool, opening one if none is idle"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        return conn
+    
+    def _release_connection(self, conn):
+        """Return a connection to the pool, closing it if the pool is full"""
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
     
     @contextmanager
     def get_connection(self):
         """
-        Get database connection with automatic cleanup
+        Get a pooled database connection with automatic commit/rollback
         
         Usage:
             with db.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT * FROM students")
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign keys
+        conn = self._acquire_connection()
         try:
             yield conn
             conn.commit()
@@ -53,7 +305,15 @@ class DatabaseManager:
             logger.error(f"Database error: {e}")
             raise
         finally:
-            conn.close()
+            self._release_connection(conn)
+    
+    def close_all_connections(self):
+        """Close every idle pooled connection"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
     
     def ensure_database_exists(self):
         """Create database and tables if they don't exist"""
@@ -63,6 +323,37 @@ class DatabaseManager:
             logger.info("Database created successfully!")
         else:
             logger.info(f"Using existing database at {self.db_path}")
+        self.apply_migrations()
+    
+    def apply_migrations(self):
+        """Apply pending schema migrations, tracked via PRAGMA user_version"""
+        # Autocommit mode so the explicit BEGIN covers the DDL too: each
+        # migration's statements and its version bump commit or roll back together
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            
+            for version, statements in MIGRATIONS:
+                if version <= current_version:
+                    continue
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # Another process may have applied it while we waited for the lock
+                    if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                        conn.execute("COMMIT")
+                        continue
+                    for statement in statements:
+                        conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {version}")
+                    conn.execute("COMMIT")
+                except Exception as e:
+                    conn.execute("ROLLBACK")
+                    logger.error(f"Database migration {version} failed: {e}")
+                    raise
+                logger.info(f"Applied database migration {version}")
+        finally:
+            conn.close()
     
     def create_tables(self):
         """Create all database tables from schema file"""
@@ -70,6 +361,8 @@ class DatabaseManager:
             with open(SCHEMA_PATH, 'r') as f:
                 schema_sql = f.read()
                 conn.executescript(schema_sql)
+            # schema.sql already includes every migration
+            conn.execute(f"PRAGMA user_version = {MIGRATIONS[-1][0]}")
             logger.info("Database schema created successfully")
     
     def drop_all_tables(self):
@@ -171,19 +464,45 @@ class DatabaseManager:
     
     def get_user_by_email(self, email):
         """Get user by email"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE email = ?", (email.lower().strip(),))
-            user = cursor.fetchone()
-            return dict(user) if user else None
+        return self.fetchone_dict("SELECT * FROM users WHERE email = ?", (email.lower().strip(),))
     
     def get_user_by_id(self, user_id):
         """Get user by ID"""
+        return self.fetchone_dict("SELECT * FROM users WHERE user_id = ?", (user_id,))
+    
+    def set_users_active_bulk(self, user_ids, is_active, acting_user_id=None):
+        """
+        Activate or deactivate several users in one transaction
+        
+        Args:
+            user_ids: List of user IDs to update
+            is_active: True to activate, False to deactivate
+            acting_user_id: User performing the change (for the audit log)
+        
+        Returns:
+            int: Number of users updated
+        """
+        if not user_ids:
+            return 0
+        
+        placeholders = ', '.join('?' * len(user_ids))
+        action = 'USER_ACTIVATED' if is_active else 'USER_DEACTIVATED'
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-            user = cursor.fetchone()
-            return dict(user) if user else None
+            cursor.execute(f"""
+                UPDATE users SET is_active = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE user_id IN ({placeholders})
+            """, [1 if is_active else 0, *user_ids])
+            updated = cursor.rowcount
+            
+            cursor.executemany("""
+                INSERT INTO audit_logs (user_id, action, entity_type, entity_id)
+                VALUES (?, ?, 'users', ?)
+            """, [(acting_user_id, action, user_id) for user_id in user_ids])
+            
+            logger.info(f"{action} for {updated} users")
+            return updated
     
     def update_password(self, user_id, new_password):
         """Update user password"""
@@ -242,16 +561,33 @@ class DatabaseManager:
             ))
             
             student_id = cursor.lastrowid
+            self._student_user_ids.pop(student_id, None)
             logger.info(f"Created student: {kwargs['first_name']} {kwargs['last_name']} (ID: {student_id})")
             return student_id
     
     def get_student_by_id(self, student_id):
         """Get student by ID"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM students WHERE student_id = ?", (student_id,))
-            student = cursor.fetchone()
-            return dict(student) if student else None
+        return self.fetchone_dict("SELECT * FROM students WHERE student_id = ?", (student_id,))
+    
+    def get_student_user_id(self, student_id):
+        """
+        Get a student's login user ID, cached until the student is updated
+        
+        Returns:
+            int or None: user_id, or None if the student has no login
+        """
+        try:
+            return self._student_user_ids[student_id]
+        except KeyError:
+            pass
+        
+        row = self.fetchone_dict("SELECT user_id FROM students WHERE student_id = ?", (student_id,))
+        user_id = row['user_id'] if row else None
+        
+        if len(self._student_user_ids) >= STUDENT_USER_ID_CACHE_SIZE:
+            self._student_user_ids.clear()
+        self._student_user_ids[student_id] = user_id
+        return user_id
     
     def get_all_students(self, filters=None):
         """
@@ -296,9 +632,24 @@ class DatabaseManager:
                 UPDATE students SET {', '.join(fields)}, updated_at = CURRENT_TIMESTAMP
                 WHERE student_id = ?
             """, values)
+            self._student_user_ids.pop(student_id, None)
             
             logger.info(f"Updated student ID: {student_id}")
     
+    # =====================================================
+    # TERMS
+    # =====================================================
+    
+    def get_current_term(self):
+        """Get the current academic term as a dict, or None"""
+        return self.fetchone_dict("""
+            SELECT term_id, term_code, term_name, year,
+                   start_date, end_date, midterm_date, is_current_term
+            FROM terms
+            WHERE is_current_term = 1
+            LIMIT 1
+        """)
+    
     # =====================================================
     # RISK SCORES
     # =====================================================
@@ -342,17 +693,12 @@ class DatabaseManager:
     
     def get_current_risk_score(self, student_id):
         """Get current risk score for a student"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM risk_scores
-                WHERE student_id = ? AND is_current = 1
-                ORDER BY score_calculation_date DESC
-                LIMIT 1
-            """, (student_id,))
-            
-            risk = cursor.fetchone()
-            return dict(risk) if risk else None
+        return self.fetchone_dict("""
+            SELECT * FROM risk_scores
+            WHERE student_id = ? AND is_current = 1
+            ORDER BY score_calculation_date DESC
+            LIMIT 1
+        """, (student_id,))
     
     def get_risk_score_history(self, student_id):
         """Get risk score history for a student"""
@@ -400,9 +746,38 @@ class DatabaseManager:
             logger.info(f"Created intervention {intervention_id} for student {student_id}")
             return intervention_id
     
-    def get_interventions(self, student_id=None, advisor_id=None, status=None):
-        """Get interventions with optional filters"""
-        query = "SELECT i.*, s.first_name || ' ' || s.last_name as student_name FROM interventions i JOIN students s ON i.student_id = s.student_id WHERE 1=1"
+    def bulk_create_interventions(self, rows):
+        """
+        Create many interventions in one transaction
+        
+        Args:
+            rows: List of (student_id, advisor_id, intervention_type_id, title,
+                  description, priority, status, scheduled_date, location,
+                  method, follow_up_required, notes)
+        
+        Returns:
+            list: intervention_ids, in the order of rows
+        """
+        if not rows:
+            return []
+        
+        with self.get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO interventions (
+                    student_id, advisor_id, intervention_type_id, title, description,
+                    priority, status, scheduled_date, location, method,
+                    follow_up_required, notes
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            
+            # AUTOINCREMENT ids are consecutive within our write transaction
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            logger.info(f"Created {len(rows)} interventions")
+            return list(range(last_id - len(rows) + 1, last_id + 1))
+    
+    def get_interventions(self, student_id=None, advisor_id=None, status=None, columns='i.*'):
+        """Get interventions with optional filters (columns: SQL select list over i)"""
+        query = f"SELECT {columns}, s.first_name || ' ' || s.last_name as student_name FROM interventions i JOIN students s ON i.student_id = s.student_id WHERE 1=1"
         params = []
         
         if student_id:
@@ -425,8 +800,16 @@ class DatabaseManager:
             interventions = cursor.fetchall()
             return [dict(intervention) for intervention in interventions]
     
-    def update_intervention(self, intervention_id, **kwargs):
-        """Update intervention"""
+    def update_intervention(self, intervention_id, append_notes=None, stamp=(), **kwargs):
+        """
+        Update intervention
+        
+        Args:
+            intervention_id: Intervention ID
+            append_notes: Text appended to the notes as a new "[timestamp] ..." entry
+            stamp: Columns set to the current local time by SQLite
+            **kwargs: Columns to overwrite
+        """
         fields = []
         values = []
         
@@ -434,6 +817,15 @@ class DatabaseManager:
             fields.append(f"{key} = ?")
             values.append(value)
         
+        for key in stamp:
+            fields.append(f"{key} = datetime('now', 'localtime')")
+        
+        if append_notes is not None:
+            fields.append(
+                "notes = COALESCE(notes, '') || char(10, 10) || '[' || datetime('now', 'localtime') || '] ' || ?"
+            )
+            values.append(append_notes)
+        
         values.append(intervention_id)
         
         with self.get_connection() as conn:
@@ -474,6 +866,37 @@ class DatabaseManager:
             logger.info(f"Created notification for user {user_id}")
             return notification_id
     
+    def create_intervention_notifications(self, intervention_ids, notification_type,
+                                          title, message, priority='Normal'):
+        """
+        Notify the students behind a set of interventions in one INSERT ... SELECT
+        
+        Students without a login are skipped by the join.
+        
+        Returns:
+            int: Number of notifications created
+        """
+        if not intervention_ids:
+            return 0
+        
+        placeholders = ', '.join('?' * len(intervention_ids))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                INSERT INTO notifications (
+                    user_id, notification_type, title, message, priority,
+                    related_entity_type, related_entity_id
+                )
+                SELECT s.user_id, ?, ?, ?, ?, 'interventions', i.intervention_id
+                FROM interventions i
+                JOIN students s ON s.student_id = i.student_id
+                WHERE i.intervention_id IN ({placeholders}) AND s.user_id IS NOT NULL
+                ORDER BY i.intervention_id
+            """, [notification_type, title, message, priority, *intervention_ids])
+            
+            logger.info(f"Created {cursor.rowcount} notifications")
+            return cursor.rowcount
+    
     def get_unread_notifications(self, user_id):
         """Get unread notifications for a user"""
         with self.get_connection() as conn:
@@ -487,6 +910,30 @@ class DatabaseManager:
             notifications = cursor.fetchall()
             return [dict(notification) for notification in notifications]
     
+    def count_unread(self, user_id):
+        """Count unread notifications for a user"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COUNT(*) FROM notifications
+                WHERE user_id = ? AND is_read = 0
+            """, (user_id,))
+            return cursor.fetchone()[0]
+    
+    def get_unread_top_n(self, user_id, n=5):
+        """Get the n most recent unread notifications for a user"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM notifications
+                WHERE user_id = ? AND is_read = 0
+                ORDER BY created_at DESC
+                LIMIT ?
+            """, (user_id, n))
+            
+            notifications = cursor.fetchall()
+            return [dict(notification) for notification in notifications]
+    
     def mark_notification_read(self, notification_id):
         """Mark notification as read"""
         with self.get_connection() as conn:
@@ -496,26 +943,217 @@ class DatabaseManager:
                 WHERE notification_id = ?
             """, (notification_id,))
     
+    def mark_notifications_read_bulk(self, notification_ids):
+        """
+        Mark several notifications as read in one statement
+        
+        Returns:
+            int: Number of notifications updated
+        """
+        if not notification_ids:
+            return 0
+        
+        placeholders = ', '.join('?' * len(notification_ids))
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                UPDATE notifications SET is_read = 1, read_at = CURRENT_TIMESTAMP
+                WHERE notification_id IN ({placeholders})
+            """, list(notification_ids))
+            return cursor.rowcount
+    
     # =====================================================
     # AUDIT LOGS
     # =====================================================
     
     def log_action(self, user_id, action, entity_type=None, entity_id=None, old_values=None, new_values=None):
-        """Log user action for audit trail"""
+        """Queue user action for the audit trail (written by the audit thread)"""
+        row = (
+            user_id,
+            action,
+            entity_type,
+            entity_id,
+            json.dumps(old_values) if old_values else None,
+            json.dumps(new_values) if new_values else None
+        )
+        
+        with self._audit_lock:
+            self._append_audit_journal(row)
+            self._audit_buf.append(row)
+            pending = len(self._audit_buf)
+            if self._audit_thread is None:
+                self._start_audit_writer()
+        
+        if pending >= AUDIT_BATCH_SIZE:
+            self._audit_wakeup.set()
+    
+    def _start_audit_writer(self):
+        """Start the background audit flusher (caller holds _audit_lock)"""
+        self._audit_thread = threading.Thread(
+            target=self._audit_writer, name="audit-writer", daemon=True
+        )
+        self._audit_thread.start()
+        # Daemon threads die with the interpreter; write whatever is left
+        atexit.register(self.flush_audit_log)
+    
+    def _audit_writer(self):
+        """Flush the audit buffer every AUDIT_FLUSH_INTERVAL seconds"""
+        while True:
+            self._audit_wakeup.wait(AUDIT_FLUSH_INTERVAL)
+            self._audit_wakeup.clear()
+            try:
+                self.flush_audit_log()
+            except Exception as e:
+                logger.error(f"Audit log flush failed: {e}")
+    
+    def flush_audit_log(self):
+        """Write all queued audit rows in one transaction"""
+        with self._audit_lock:
+            batch, self._audit_buf = self._audit_buf, []
+            if not batch:
+                return 0
+            segments, self._audit_segments = self._audit_segments, []
+            try:
+                # The rows now being written are covered by these journal files
+                self._rotate_audit_journal(segments)
+            except Exception:
+                self._requeue_audit_rows(batch, segments)
+                raise
+        
+        try:
+            self._insert_audit_rows(batch)
+        except Exception:
+            # Keep the rows (and their journal) for the next flush
+            with self._audit_lock:
+                self._requeue_audit_rows(batch, segments)
+            raise
+        
+        for segment in segments:
+            segment.unlink(missing_ok=True)
+        
+        return len(batch)
+    
+    def _requeue_audit_rows(self, batch, segments):
+        """Put an unwritten batch back in front of the buffer (caller holds _audit_lock)"""
+        self._audit_buf[:0] = batch
+        self._audit_segments[:0] = segments
+    
+    def _insert_audit_rows(self, rows):
+        """Insert audit rows in one transaction"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+            conn.executemany("""
                 INSERT INTO audit_logs (
                     user_id, action, entity_type, entity_id, old_values, new_values
                 ) VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                user_id,
-                action,
-                entity_type,
-                entity_id,
-                json.dumps(old_values) if old_values else None,
-                json.dumps(new_values) if new_values else None
-            ))
+            """, rows)
+    
+    def _append_audit_journal(self, row):
+        """Append one audit row to the journal (caller holds _audit_lock)"""
+        if self._audit_journal is None:
+            self._audit_journal = open(self._audit_journal_path, 'a', encoding='utf-8')
+        
+        self._audit_journal.write(json.dumps(row) + "\n")
+        self._audit_journal.flush()
+        self._audit_unsynced += 1
+        if self._audit_unsynced >= AUDIT_FSYNC_EVERY:
+            os.fsync(self._audit_journal.fileno())
+            self._audit_unsynced = 0
+    
+    def _rotate_audit_journal(self, segments):
+        """Close the journal and add it to segments (caller holds _audit_lock)"""
+        if self._audit_journal is not None:
+            journal, self._audit_journal = self._audit_journal, None
+            self._audit_unsynced = 0
+            try:
+                os.fsync(journal.fileno())
+            finally:
+                journal.close()
+        
+        # Also picks up a journal left behind by an earlier failed rotation
+        if not self._audit_journal_path.exists():
+            return
+        segment = Path(f"{self._audit_journal_path}.{time.time_ns()}")
+        self._audit_journal_path.rename(segment)
+        segments.append(segment)
+    
+    def _claim_audit_journal(self):
+        """Take the lock that marks this manager's journal files as in use"""
+        self._audit_owner = open(self._audit_owner_path, 'a')
+        if fcntl is not None:
+            fcntl.flock(self._audit_owner.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        atexit.register(self._release_audit_journal)
+    
+    def _release_audit_journal(self):
+        """Flush on exit and drop the lock file once no journal is left"""
+        try:
+            self.flush_audit_log()
+        except Exception as e:
+            logger.error(f"Audit log flush failed: {e}")
+        
+        if not self._audit_journal_files(self._audit_journal_path):
+            self._audit_owner_path.unlink(missing_ok=True)
+        self._audit_owner.close()
+    
+    @staticmethod
+    def _audit_journal_files(journal_path):
+        """Live journal and rotated segments belonging to one journal path"""
+        files = [journal_path] if journal_path.exists() else []
+        files += [
+            path for path in journal_path.parent.glob(journal_path.name + ".*")
+            if path.suffix != ".lock"
+        ]
+        return sorted(files)
+    
+    def _replay_audit_journals(self):
+        """Insert audit rows left in journal files by processes that died"""
+        pattern = f"{Path(self.db_path).name}{AUDIT_JOURNAL_SUFFIX}-*.lock"
+        for owner_path in sorted(self._audit_journal_path.parent.glob(pattern)):
+            journal_path = owner_path.with_suffix("")
+            try:
+                if owner_path == self._audit_owner_path:
+                    # Ours since before anything was logged: a previous
+                    # process with the same pid left these behind
+                    self._replay_audit_journal(journal_path)
+                elif fcntl is not None:
+                    self._replay_orphaned_journal(owner_path, journal_path)
+            except Exception as e:
+                # Files stay in place and are retried on the next startup
+                logger.error(f"Could not replay audit journal {journal_path}: {e}")
+    
+    def _replay_orphaned_journal(self, owner_path, journal_path):
+        """Replay another manager's journal if its lock shows it has exited"""
+        with open(owner_path, 'a') as owner:
+            try:
+                fcntl.flock(owner.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return  # Still running; its own flushes will write these rows
+            
+            self._replay_audit_journal(journal_path)
+            owner_path.unlink(missing_ok=True)
+    
+    def _replay_audit_journal(self, journal_path):
+        """Insert the rows from one journal path's files, then delete them"""
+        journals = self._audit_journal_files(journal_path)
+        if not journals:
+            return
+        
+        rows = []
+        for journal in journals:
+            with open(journal, encoding='utf-8') as f:
+                # A torn final line from a crash mid-write is skipped
+                for line in f:
+                    try:
+                        row = tuple(json.loads(line))
+                    except (ValueError, TypeError):
+                        continue
+                    if len(row) == 6:
+                        rows.append(row)
+        
+        self._insert_audit_rows(rows)
+        for journal in journals:
+            journal.unlink(missing_ok=True)
+        logger.info(f"Replayed {len(rows)} audit log entries from {journal_path.name}")
     
     # =====================================================
     # UTILITY METHODS
@@ -533,6 +1171,22 @@ class DatabaseManager:
             results = cursor.fetchall()
             return [dict(row) for row in results]
     
+    def fetch_rows(self, query, params=()):
+        """
+        Run a query and return its rows as sqlite3.Row objects
+        
+        Rows support row['column'] and keys() without building a dict per
+        row; use for list endpoints that only read them.
+        """
+        with self.get_connection() as conn:
+            return conn.execute(query, params).fetchall()
+    
+    def fetchone_dict(self, query, params=()):
+        """Run a query and return its first row as a dict, or None"""
+        with self.get_connection() as conn:
+            row = conn.execute(query, params).fetchone()
+            return dict(row) if row else None
+    
     def get_table_count(self, table_name):
         """Get row count for a table"""
         with self.get_connection() as conn:
@@ -541,6 +1195,50 @@ class DatabaseManager:
             result = cursor.fetchone()
             return result['count']
     
+    def get_dashboard_summary(self):
+        """
+        Get headline student statistics computed in SQL
+
+        Returns:
+            dict: total_students, avg_gpa, risk_counts, first_gen_count,
+                  international_count (active students only)
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COUNT(*) as total_students,
+                       COALESCE(SUM(first_generation_student), 0) as first_gen_count,
+                       COALESCE(SUM(international_student), 0) as international_count
+                FROM students
+                WHERE enrollment_status = 'Active'
+            """)
+            summary = dict(cursor.fetchone())
+
+            cursor.execute("""
+                SELECT rs.risk_category, COUNT(*) as count
+                FROM risk_scores rs
+                JOIN students s ON rs.student_id = s.student_id
+                WHERE rs.is_current = 1 AND s.enrollment_status = 'Active'
+                  AND rs.risk_category IS NOT NULL
+                GROUP BY rs.risk_category
+                ORDER BY count DESC
+            """)
+            summary['risk_counts'] = {row['risk_category']: row['count'] for row in cursor.fetchall()}
+
+            # Average of per-student mean grade percentage, on a 4.0 scale
+            cursor.execute("""
+                SELECT AVG(avg_percentage) / 25 as avg_gpa
+                FROM (
+                    SELECT AVG(g.grade_percentage) as avg_percentage
+                    FROM grades g
+                    JOIN enrollments e ON g.enrollment_id = e.enrollment_id
+                    GROUP BY e.student_id
+                )
+            """)
+            summary['avg_gpa'] = cursor.fetchone()['avg_gpa'] or 0.0
+
+            return summary
+
     def get_database_stats(self):
         """Get database statistics"""
         stats = {}
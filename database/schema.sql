@@ -63,6 +63,8 @@ CREATE TABLE IF NOT EXISTS students (
     emergency_contact_phone VARCHAR(20),
     photo_url VARCHAR(500),
     notes TEXT,
+    current_risk_score REAL,  -- Copy of the current risk_scores row, set by triggers
+    current_risk_category VARCHAR(50),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(user_id),
@@ -366,6 +368,27 @@ CREATE INDEX idx_risk_scores_student ON risk_scores(student_id);
 CREATE INDEX idx_risk_scores_term ON risk_scores(term_id);
 CREATE INDEX idx_risk_scores_category ON risk_scores(risk_category);
 CREATE INDEX idx_risk_scores_current ON risk_scores(is_current);
+CREATE INDEX idx_risk_scores_current_student ON risk_scores(is_current, student_id);
+
+-- Keep students.current_risk_score / current_risk_category in step
+CREATE TRIGGER trg_risk_scores_current_insert
+AFTER INSERT ON risk_scores WHEN NEW.is_current = 1
+BEGIN
+    UPDATE students
+    SET current_risk_score = NEW.overall_risk_score,
+        current_risk_category = NEW.risk_category
+    WHERE student_id = NEW.student_id;
+END;
+
+CREATE TRIGGER trg_risk_scores_current_update
+AFTER UPDATE OF is_current, overall_risk_score, risk_category ON risk_scores
+WHEN NEW.is_current = 1
+BEGIN
+    UPDATE students
+    SET current_risk_score = NEW.overall_risk_score,
+        current_risk_category = NEW.risk_category
+    WHERE student_id = NEW.student_id;
+END;
 
 -- =====================================================
 -- 15. INTERVENTION TYPES (Templates)
@@ -411,6 +434,8 @@ CREATE TABLE IF NOT EXISTS interventions (
     follow_up_date DATE,
     success_rating INTEGER CHECK(success_rating BETWEEN 1 AND 5),
     notes TEXT,
+    type_name VARCHAR(200),      -- Copied from intervention_types by triggers
+    type_category VARCHAR(100),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (student_id) REFERENCES students(student_id),
@@ -423,6 +448,45 @@ CREATE INDEX idx_interventions_advisor ON interventions(advisor_id);
 CREATE INDEX idx_interventions_status ON interventions(status);
 CREATE INDEX idx_interventions_priority ON interventions(priority);
 CREATE INDEX idx_interventions_scheduled ON interventions(scheduled_date);
+CREATE INDEX idx_interventions_advisor_date ON interventions(advisor_id, scheduled_date DESC);
+CREATE INDEX idx_interventions_student_date ON interventions(student_id, scheduled_date DESC);
+CREATE INDEX idx_interventions_status_advisor ON interventions(status, advisor_id, scheduled_date);
+CREATE INDEX idx_interventions_overdue ON interventions(advisor_id, scheduled_date) WHERE status = 'Scheduled';
+CREATE INDEX idx_interventions_followup ON interventions(follow_up_date) WHERE follow_up_required = 1 AND status = 'Completed';
+CREATE INDEX idx_interventions_overdue_date ON interventions(scheduled_date) WHERE status = 'Scheduled';
+CREATE INDEX idx_interventions_created ON interventions(created_at);
+CREATE INDEX idx_interventions_type ON interventions(type_category, type_name);
+
+-- Keep interventions.type_name / type_category in step
+CREATE TRIGGER trg_interventions_type_insert
+AFTER INSERT ON interventions WHEN NEW.intervention_type_id IS NOT NULL
+BEGIN
+    UPDATE interventions
+    SET type_name = (SELECT type_name FROM intervention_types
+                     WHERE intervention_type_id = NEW.intervention_type_id),
+        type_category = (SELECT category FROM intervention_types
+                         WHERE intervention_type_id = NEW.intervention_type_id)
+    WHERE intervention_id = NEW.intervention_id;
+END;
+
+CREATE TRIGGER trg_interventions_type_update
+AFTER UPDATE OF intervention_type_id ON interventions
+BEGIN
+    UPDATE interventions
+    SET type_name = (SELECT type_name FROM intervention_types
+                     WHERE intervention_type_id = NEW.intervention_type_id),
+        type_category = (SELECT category FROM intervention_types
+                         WHERE intervention_type_id = NEW.intervention_type_id)
+    WHERE intervention_id = NEW.intervention_id;
+END;
+
+CREATE TRIGGER trg_intervention_types_rename
+AFTER UPDATE OF type_name, category ON intervention_types
+BEGIN
+    UPDATE interventions
+    SET type_name = NEW.type_name, type_category = NEW.category
+    WHERE intervention_type_id = NEW.intervention_type_id;
+END;
 
 -- =====================================================
 -- 17. APPOINTMENTS (Scheduled Meetings)
@@ -476,6 +540,7 @@ CREATE TABLE IF NOT EXISTS notifications (
 CREATE INDEX idx_notifications_user ON notifications(user_id);
 CREATE INDEX idx_notifications_read ON notifications(is_read);
 CREATE INDEX idx_notifications_created ON notifications(created_at);
+CREATE INDEX idx_notifications_user_unread ON notifications(user_id, is_read, created_at DESC);
 
 -- =====================================================
 -- 19. EMAIL QUEUE (Outbound Emails)
@@ -496,11 +561,16 @@ CREATE TABLE IF NOT EXISTS email_queue (
     error_message TEXT,
     retry_count INTEGER DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    dedup_key TEXT,
+    claimed_at TIMESTAMP
 );
 
 CREATE INDEX idx_email_queue_status ON email_queue(status);
 CREATE INDEX idx_email_queue_scheduled ON email_queue(scheduled_send_time);
+CREATE INDEX idx_email_queue_pending ON email_queue(status, priority DESC, created_at) WHERE status = 'Pending';
+CREATE UNIQUE INDEX idx_email_queue_dedup ON email_queue(dedup_key) WHERE status IN ('Pending', 'Sending') AND retry_count < 3;
+CREATE INDEX idx_email_queue_claimed ON email_queue(claimed_at) WHERE status = 'Sending';
 
 -- =====================================================
 -- 20. AUDIT LOGS (System Activity Tracking)
@@ -587,6 +657,50 @@ CREATE TABLE IF NOT EXISTS student_notes (
 CREATE INDEX idx_student_notes_student ON student_notes(student_id);
 CREATE INDEX idx_student_notes_advisor ON student_notes(advisor_id);
 
+-- =====================================================
+-- 24. STUDENT OVERVIEW (Denormalized per-student view)
+-- =====================================================
+
+CREATE VIEW IF NOT EXISTS v_student_overview AS
+SELECT
+    s.student_id,
+    s.user_id,
+    s.banner_id,
+    s.first_name,
+    s.last_name,
+    s.email,
+    s.classification,
+    s.enrollment_status,
+    s.first_generation_student,
+    s.international_student,
+    s.primary_advisor_id,
+    rs.overall_risk_score,
+    rs.academic_risk_factor,
+    rs.engagement_risk_factor,
+    rs.financial_risk_factor,
+    rs.wellness_risk_factor,
+    rs.risk_category,
+    rs.risk_pathway,
+    (SELECT AVG(g.grade_percentage)
+     FROM grades g
+     JOIN enrollments e ON g.enrollment_id = e.enrollment_id
+     WHERE e.student_id = s.student_id) AS avg_grade,
+    (SELECT i.title
+     FROM interventions i
+     WHERE i.student_id = s.student_id
+     ORDER BY i.created_at DESC, i.intervention_id DESC
+     LIMIT 1) AS latest_intervention_title,
+    (SELECT i.status
+     FROM interventions i
+     WHERE i.student_id = s.student_id
+     ORDER BY i.created_at DESC, i.intervention_id DESC
+     LIMIT 1) AS latest_intervention_status,
+    (SELECT COUNT(*)
+     FROM notifications n
+     WHERE n.user_id = s.user_id AND n.is_read = 0) AS unread_notifications
+FROM students s
+LEFT JOIN risk_scores rs ON rs.student_id = s.student_id AND rs.is_current = 1;
+
 -- =====================================================
 -- END OF SCHEMA
 -- =====================================================
@@ -16,7 +16,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 try:
     from utils.db_data_loader import (
         load_students, load_risk_scores, load_enrollments, 
-        load_logins, load_grades, load_counseling, load_attendance
+        load_logins, load_grades, load_counseling, load_attendance,
+        load_student_overview
     )
     from utils.intervention_manager import intervention_manager
     from database.db_manager import db
@@ -212,29 +213,37 @@ st.divider()
 
 # Load data
 with st.spinner("Loading student data..."):
-    students = load_students()
-    risk_scores = load_risk_scores()
     enrollments = load_enrollments()
-    grades = load_grades()
     counseling = load_counseling()
     attendance_data = load_attendance()
     logins = load_logins()  # Add logins here
-
-# Merge data
-df = students.merge(risk_scores, on='StudentID', how='left')
-
-# Calculate GPA for each student from grades
-gpa_dict = {}
-for student_id in df['StudentID']:
-    student_enr = enrollments[enrollments['StudentID'] == student_id]
-    student_grd = grades[grades['EnrollmentID'].isin(student_enr['EnrollmentID'])]
-    if len(student_grd) > 0:
-        gpa = student_grd['GradePercentage'].mean() / 25  # Convert to 4.0 scale
-        gpa_dict[student_id] = gpa
+    
+    if DATABASE_MODE:
+        # Students, current risk scores and GPA in one query
+        df = load_student_overview()
     else:
-        gpa_dict[student_id] = 3.0  # Default
+        students = load_students()
+        risk_scores = load_risk_scores()
+        grades = load_grades()
 
-df['CalculatedGPA'] = df['StudentID'].map(gpa_dict)
+if DATABASE_MODE:
+    df['CalculatedGPA'] = df['CalculatedGPA'].fillna(3.0)  # Default
+else:
+    # Merge data
+    df = students.merge(risk_scores, on='StudentID', how='left')
+    
+    # Calculate GPA for each student from grades
+    gpa_dict = {}
+    for student_id in df['StudentID']:
+        student_enr = enrollments[enrollments['StudentID'] == student_id]
+        student_grd = grades[grades['EnrollmentID'].isin(student_enr['EnrollmentID'])]
+        if len(student_grd) > 0:
+            gpa = student_grd['GradePercentage'].mean() / 25  # Convert to 4.0 scale
+            gpa_dict[student_id] = gpa
+        else:
+            gpa_dict[student_id] = 3.0  # Default
+    
+    df['CalculatedGPA'] = df['StudentID'].map(gpa_dict)
 
 # Add search functionality
 st.markdown("### 🔍 Search Students")
@@ -272,6 +281,7 @@ sort_by = st.sidebar.selectbox(
 st.sidebar.markdown("---")
 if st.sidebar.button("🔄 Refresh Data"):
     st.cache_data.clear()
+    st.cache_resource.clear()
     st.rerun()
 
 # Apply filters
@@ -0,0 +1,44 @@
+"""
+Premium Stylesheet Build Script
+================================
+Renders the premium CSS template with the COLORS palette, minifies it and
+writes utils/premium.min.css, which the app reads at startup.
+
+Run after changing COLORS or the stylesheet template:
+    python scripts/build_css.py
+    python scripts/build_css.py --check   # exit 1 if the file is stale
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.premium_design import PREMIUM_CSS_FILE, build_premium_css
+
+
+def main(check=False):
+    """Write the stylesheet, or with check=True report whether it is current"""
+    css = build_premium_css()
+
+    try:
+        current = PREMIUM_CSS_FILE.read_text(encoding="utf-8")
+    except OSError:
+        current = None
+
+    if check:
+        if current != css:
+            print(f"❌ {PREMIUM_CSS_FILE.name} is out of date; run scripts/build_css.py")
+            return False
+        print(f"✅ {PREMIUM_CSS_FILE.name} is up to date")
+        return True
+
+    PREMIUM_CSS_FILE.write_text(css, encoding="utf-8")
+    print(f"✅ Wrote {PREMIUM_CSS_FILE} ({len(css)} bytes)")
+    return True
+
+
+if __name__ == "__main__":
+    ok = main(check="--check" in sys.argv[1:])
+    sys.exit(0 if ok else 1)
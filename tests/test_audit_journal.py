@@ -0,0 +1,94 @@
+"""
+Tests for the audit log write-behind journal
+Rows buffered by log_action survive a crash and are replayed exactly once,
+a running process's journal is left alone, and a clean exit leaves no files
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import db_manager
+from database.db_manager import DatabaseManager, AUDIT_JOURNAL_SUFFIX
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROWS = 25
+
+
+def run_logger(db_path, ending):
+    """Log ROWS audit actions in a separate process, then end it with `ending`"""
+    script = textwrap.dedent(f"""
+        from pathlib import Path
+        import os
+        from database import db_manager
+        db_manager.AUDIT_FLUSH_INTERVAL = 3600  # Only the exit hook flushes
+        db_manager.AUDIT_BATCH_SIZE = 10 ** 6
+        manager = db_manager.DatabaseManager(Path({str(db_path)!r}))
+        for i in range({ROWS}):
+            manager.log_action(None, 'JOURNAL_TEST', 'students', i)
+        {ending}
+    """)
+    subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, check=True)
+
+
+def logged_rows(db_path):
+    """Count the JOURNAL_TEST rows in audit_logs"""
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM audit_logs WHERE action = 'JOURNAL_TEST'"
+        ).fetchone()[0]
+
+
+def journal_files(db_path):
+    """Journal, segment and lock files next to the database"""
+    return sorted(db_path.parent.glob(f"{db_path.name}{AUDIT_JOURNAL_SUFFIX}*"))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "hsu_database.db"
+    # Create the schema, then release this manager's lock as a clean exit would
+    DatabaseManager(path)._release_audit_journal()
+    return path
+
+
+def test_crashed_process_rows_are_replayed_once(db_path):
+    run_logger(db_path, "os._exit(0)  # Crash: no flush, no cleanup")
+    assert logged_rows(db_path) == 0
+    assert journal_files(db_path)
+    
+    DatabaseManager(db_path)
+    assert logged_rows(db_path) == ROWS
+    
+    DatabaseManager(db_path)
+    assert logged_rows(db_path) == ROWS
+
+
+@pytest.mark.skipif(db_manager.fcntl is None, reason="journal ownership needs fcntl locks")
+def test_live_owner_journal_is_not_replayed(db_path, monkeypatch):
+    monkeypatch.setattr(db_manager, "AUDIT_FLUSH_INTERVAL", 3600)
+    monkeypatch.setattr(db_manager, "AUDIT_BATCH_SIZE", 10 ** 6)
+    owner = DatabaseManager(db_path)
+    for i in range(ROWS):
+        owner.log_action(None, 'JOURNAL_TEST', 'students', i)
+    
+    # Another process starting up must leave our journal alone
+    run_logger(db_path, "pass")
+    assert logged_rows(db_path) == ROWS  # Only the other process's own rows
+    assert owner._audit_journal_path.exists()
+    
+    owner.flush_audit_log()
+    assert logged_rows(db_path) == 2 * ROWS
+
+
+def test_clean_exit_removes_journal_and_lock(db_path):
+    run_logger(db_path, "")
+    assert logged_rows(db_path) == ROWS
+    assert journal_files(db_path) == []
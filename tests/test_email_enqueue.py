@@ -0,0 +1,52 @@
+"""
+Tests for the background email enqueue writer
+Queued emails must reach email_queue even when the process exits while the
+writer is still holding a batch
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip("jinja2")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_emails_queued_before_exit_reach_email_queue(tmp_path):
+    """Rows held by the writer (mid-insert) and still buffered are written at exit"""
+    db_path = tmp_path / "hsu_database.db"
+    script = textwrap.dedent(f"""
+        import time
+        from pathlib import Path
+        import database.db_manager as db_manager
+        db_manager.db = db_manager.DatabaseManager(Path({str(db_path)!r}))
+        from utils.email_service import EmailService
+
+        service = EmailService()
+        insert = service._insert_enqueued
+
+        def slow_insert(rows):
+            time.sleep(0.5)  # Still inserting when the interpreter exits
+            insert(rows)
+
+        service._insert_enqueued = slow_insert
+        for i in range(20):
+            service._queue_email(f"student{{i}}@hsu.edu", f"Subject {{i}}",
+                                 "<p>Body</p>", None, None, 3)
+        time.sleep(0.3)  # Let the writer take the first batch
+        for i in range(20, 25):
+            service._queue_email(f"student{{i}}@hsu.edu", f"Subject {{i}}",
+                                 "<p>Body</p>", None, None, 3)
+    """)
+    subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, check=True)
+
+    with sqlite3.connect(db_path) as conn:
+        count = conn.execute(
+            "SELECT COUNT(*) FROM email_queue WHERE subject LIKE 'Subject %'"
+        ).fetchone()[0]
+    assert count == 25
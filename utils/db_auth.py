@@ -295,7 +295,7 @@ def require_role(allowed_roles):
     if isinstance(allowed_roles, str):
         allowed_roles = [allowed_roles]
     
-    user_role = st.session_state.get("role", "")
+    user_role = get_user_role() or ""
     
     if user_role not in allowed_roles:
         st.error(f"🚫 Access Denied: This page requires {', '.join(allowed_roles)} role")
@@ -306,6 +306,10 @@ def require_role(allowed_roles):
 # USER INFORMATION
 # =====================================================
 
+# The role guards below read session_state directly: it is already per
+# session, and login code outside this module (pages/0_🔐_Login.py,
+# utils/auth.py) writes the identity there, so no copy can go stale.
+
 def get_current_user():
     """
     Get current logged-in user info
@@ -323,15 +327,15 @@ def get_user_role():
 
 def is_student():
     """Check if current user is a student"""
-    return get_user_role() == "student"
+    return st.session_state.get("role") == "student"
 
 def is_advisor():
     """Check if current user is an advisor"""
-    return get_user_role() == "advisor"
+    return st.session_state.get("role") == "advisor"
 
 def is_admin():
     """Check if current user is an admin"""
-    return get_user_role() == "admin"
+    return st.session_state.get("role") == "admin"
 
 def get_student_id():
     """Get student ID for student users"""
@@ -351,26 +355,39 @@ def get_user_id():
 
 def display_user_info():
     """Display current user info in sidebar"""
+    with st.sidebar:
+        _user_info_panel()
+
+@st.fragment
+def _user_info_panel():
+    """Sidebar user profile; reruns on its own when the logout button is used"""
     user = get_current_user()
     
     if user:
-        st.sidebar.markdown("---")
-        st.sidebar.markdown("### 👤 User Profile")
-        st.sidebar.write(f"**Name:** {user['first_name']} {user['last_name']}")
-        st.sidebar.write(f"**Role:** {user['role'].title()}")
-        st.sidebar.write(f"**Email:** {user['email']}")
+        role = user['role']
+        get = user.get
         
-        if user['role'] == 'advisor':
-            st.sidebar.write(f"**Dept:** {user.get('department', 'N/A')}")
-            st.sidebar.write(f"**Office:** {user.get('office_location', 'N/A')}")
+        lines = [
+            "---",
+            "### 👤 User Profile",
+            f"**Name:** {user['first_name']} {user['last_name']}",
+            f"**Role:** {role.title()}",
+            f"**Email:** {user['email']}",
+        ]
         
-        if user['role'] == 'student':
-            st.sidebar.write(f"**Student ID:** {user.get('student_id', 'N/A')}")
-            st.sidebar.write(f"**Banner ID:** {user.get('banner_id', 'N/A')}")
+        if role == 'advisor':
+            lines.append(f"**Dept:** {get('department', 'N/A')}")
+            lines.append(f"**Office:** {get('office_location', 'N/A')}")
+        elif role == 'student':
+            lines.append(f"**Student ID:** {get('student_id', 'N/A')}")
+            lines.append(f"**Banner ID:** {get('banner_id', 'N/A')}")
+        
+        lines.append("---")
         
-        st.sidebar.markdown("---")
+        # One markdown element instead of one per line
+        st.markdown("\n\n".join(lines))
         
-        if st.sidebar.button("🚪 Logout", use_container_width=True):
+        if st.button("🚪 Logout", use_container_width=True):
             logout()
 
 # =====================================================
@@ -492,14 +509,8 @@ def deactivate_user(user_id):
         return False, "Unauthorized"
     
     try:
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE users SET is_active = 0, updated_at = CURRENT_TIMESTAMP
-                WHERE user_id = ?
-            """, (user_id,))
-        
-        db.log_action(get_user_id(), 'USER_DEACTIVATED', 'users', user_id)
+        # Status change and audit entry are written in one transaction
+        db.set_users_active_bulk([user_id], False, acting_user_id=get_user_id())
         return True, "User deactivated successfully"
     except Exception as e:
         return False, f"Deactivation failed: {str(e)}"
@@ -510,18 +521,34 @@ def activate_user(user_id):
         return False, "Unauthorized"
     
     try:
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE users SET is_active = 1, updated_at = CURRENT_TIMESTAMP
-                WHERE user_id = ?
-            """, (user_id,))
-        
-        db.log_action(get_user_id(), 'USER_ACTIVATED', 'users', user_id)
+        # Status change and audit entry are written in one transaction
+        db.set_users_active_bulk([user_id], True, acting_user_id=get_user_id())
         return True, "User activated successfully"
     except Exception as e:
         return False, f"Activation failed: {str(e)}"
 
+def deactivate_users(user_ids):
+    """Deactivate several user accounts at once (admin only)"""
+    if not is_admin():
+        return False, "Unauthorized"
+    
+    try:
+        count = db.set_users_active_bulk(user_ids, False, acting_user_id=get_user_id())
+        return True, f"{count} users deactivated successfully"
+    except Exception as e:
+        return False, f"Deactivation failed: {str(e)}"
+
+def activate_users(user_ids):
+    """Activate several user accounts at once (admin only)"""
+    if not is_admin():
+        return False, "Unauthorized"
+    
+    try:
+        count = db.set_users_active_bulk(user_ids, True, acting_user_id=get_user_id())
+        return True, f"{count} users activated successfully"
+    except Exception as e:
+        return False, f"Activation failed: {str(e)}"
+
 # =====================================================
 # NOTIFICATIONS
 # =====================================================
@@ -549,18 +576,38 @@ def create_notification(user_id, title, message, notification_type='info', **kwa
 def mark_notification_read(notification_id):
     """Mark notification as read"""
     db.mark_notification_read(notification_id)
+
+def mark_notifications_read(notification_ids):
+    """Mark several notifications as read at once"""
+    return db.mark_notifications_read_bulk(notification_ids)
     
 def display_notifications():
     """Display notifications in sidebar"""
-    notifications = get_user_notifications()
+    with st.sidebar:
+        _notifications_panel()
+
+@st.fragment(run_every=60)
+def _notifications_panel():
+    """
+    Sidebar notification list
+    
+    Runs as a fragment so unrelated widget interactions don't re-query
+    notifications; it refreshes itself once a minute instead.
+    """
+    user_id = get_user_id()
+    unread_count = db.count_unread(user_id) if user_id else 0
     
-    if notifications:
-        st.sidebar.markdown("---")
-        st.sidebar.markdown(f"### 🔔 Notifications ({len(notifications)})")
+    if unread_count:
+        st.markdown("---")
+        st.markdown(f"### 🔔 Notifications ({unread_count})")
         
-        for notif in notifications[:5]:  # Show top 5
-            with st.sidebar.expander(notif['title'], expanded=False):
+        for notif in db.get_unread_top_n(user_id, 5):  # Show top 5
+            with st.expander(notif['title'], expanded=False):
                 st.write(notif['message'])
-                if st.button(f"Mark as read", key=f"notif_{notif['notification_id']}"):
-                    mark_notification_read(notif['notification_id'])
-                    st.rerun()
+                # Callback runs before the fragment reruns, so the list is already updated
+                st.button(
+                    "Mark as read",
+                    key=f"notif_{notif['notification_id']}",
+                    on_click=mark_notification_read,
+                    args=(notif['notification_id'],)
+                )
@@ -17,34 +17,96 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 from database.db_manager import db
 
+# =====================================================
+# QUERY HELPERS
+# =====================================================
+
+def _read_sql(query, params=None, parse_dates=None, categorical=()):
+    """
+    Stream query results straight into a DataFrame over a live connection
+    
+    Columns listed in `categorical` are stored as pandas categories, which
+    keeps low-cardinality text columns small and speeds up groupby/value_counts.
+    """
+    with db.get_connection() as conn:
+        df = pd.read_sql_query(query, conn, params=params, parse_dates=parse_dates)
+    
+    return _as_categories(df, categorical)
+
+def _as_categories(df, columns):
+    """Convert the given columns (when present) to categorical dtype"""
+    for col in columns:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+# Compatibility names for students table columns (matches the CSV loader)
+STUDENT_COLUMN_NAMES = {
+    'student_id': 'StudentID',
+    'banner_id': 'BannerID',
+    'first_name': 'FirstName',
+    'last_name': 'LastName',
+    'email': 'Email',
+    'phone_number': 'PhoneNumber',
+    'date_of_birth': 'DateOfBirth',
+    'gender': 'Gender',
+    'classification': 'Classification',
+    'first_generation_student': 'FirstGenerationStudent',
+    'international_student': 'InternationalStudent'
+}
+
+# Compatibility names for terms table columns (matches load_terms)
+TERM_COLUMN_NAMES = {
+    'term_id': 'TermID',
+    'term_code': 'TermCode',
+    'term_name': 'TermName',
+    'year': 'Year',
+    'start_date': 'StartDate',
+    'end_date': 'EndDate',
+    'midterm_date': 'MidtermDate',
+    'is_current_term': 'IsCurrentTerm'
+}
+
+# Enum-like columns stored as pandas categories, per loader
+CATEGORICAL_COLUMNS = {
+    'students': ('Classification', 'Gender', 'enrollment_status'),
+    'risk_scores': ('RiskCategory', 'RiskPathway'),
+    'enrollments': ('Status', 'Grade', 'TermName'),
+    'grades': ('AssignmentType',),
+    'attendance': ('Status',),
+    'logins': ('ActivityType',),
+    'counseling': ('ConcernType', 'Status'),
+    'interventions': ('Priority', 'Status', 'Method'),
+}
+
 # =====================================================
 # CACHED DATA LOADERS
 # =====================================================
+#
+# The large per-student tables (students, enrollments, grades, attendance,
+# logins, payments) are cached with st.cache_resource: every session gets the
+# same DataFrame object instead of an unpickled copy. Treat those frames as
+# read-only - filtering, merging and column selection are fine, but call
+# .copy() before adding columns, renaming or sorting in place.
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+@st.cache_resource(ttl=300)  # Cache for 5 minutes, shared - do not mutate
 def load_students():
-    """Load all active students"""
+    """Load all active students (shared, read-only DataFrame)"""
     try:
-        students = db.get_all_students()
-        df = pd.DataFrame(students)
+        df = _read_sql(
+            """
+            SELECT * FROM students
+            WHERE enrollment_status = 'Active'
+            ORDER BY last_name, first_name
+            """,
+            parse_dates=['date_of_birth']
+        )
         
-        # Add computed columns for compatibility
-        if not df.empty and 'student_id' in df.columns:
-            df = df.rename(columns={
-                'student_id': 'StudentID',
-                'banner_id': 'BannerID',
-                'first_name': 'FirstName',
-                'last_name': 'LastName',
-                'email': 'Email',
-                'phone_number': 'PhoneNumber',
-                'date_of_birth': 'DateOfBirth',
-                'gender': 'Gender',
-                'classification': 'Classification',
-                'first_generation_student': 'FirstGenerationStudent',
-                'international_student': 'InternationalStudent'
-            })
+        # Rename columns for compatibility
+        if not df.empty:
+            df = df.rename(columns=STUDENT_COLUMN_NAMES)
         
-        return df
+        return _as_categories(df, CATEGORICAL_COLUMNS['students'])
     except Exception as e:
         st.error(f"Error loading students: {e}")
         return pd.DataFrame()
@@ -68,16 +130,18 @@ def load_risk_scores():
             WHERE rs.is_current = 1
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(
+            query,
+            parse_dates=['ScoreCalculationDate'],
+            categorical=CATEGORICAL_COLUMNS['risk_scores']
+        )
     except Exception as e:
         st.error(f"Error loading risk scores: {e}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=300)
+@st.cache_resource(ttl=300)  # Shared - do not mutate
 def load_enrollments():
-    """Load course enrollments"""
+    """Load course enrollments (shared, read-only DataFrame)"""
     try:
         query = """
             SELECT 
@@ -99,16 +163,18 @@ def load_enrollments():
             JOIN terms t ON e.term_id = t.term_id
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(
+            query,
+            parse_dates=['EnrollmentDate', 'WithdrawalDate'],
+            categorical=CATEGORICAL_COLUMNS['enrollments']
+        )
     except Exception as e:
         st.error(f"Error loading enrollments: {e}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=300)
+@st.cache_resource(ttl=300)  # Shared - do not mutate
 def load_grades():
-    """Load grade records"""
+    """Load grade records (shared, read-only DataFrame)"""
     try:
         query = """
             SELECT 
@@ -126,16 +192,18 @@ def load_grades():
             JOIN enrollments e ON g.enrollment_id = e.enrollment_id
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(
+            query,
+            parse_dates=['SubmissionDate'],
+            categorical=CATEGORICAL_COLUMNS['grades']
+        )
     except Exception as e:
         st.error(f"Error loading grades: {e}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=300)
+@st.cache_resource(ttl=300)  # Shared - do not mutate
 def load_attendance():
-    """Load attendance records"""
+    """Load attendance records (shared, read-only DataFrame)"""
     try:
         query = """
             SELECT 
@@ -149,16 +217,18 @@ def load_attendance():
             JOIN enrollments e ON a.enrollment_id = e.enrollment_id
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(
+            query,
+            parse_dates=['ClassDate'],
+            categorical=CATEGORICAL_COLUMNS['attendance']
+        )
     except Exception as e:
         st.error(f"Error loading attendance: {e}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=300)
+@st.cache_resource(ttl=300)  # Shared - do not mutate
 def load_logins():
-    """Load LMS login records"""
+    """Load LMS login records (shared, read-only DataFrame)"""
     try:
         query = """
             SELECT 
@@ -172,16 +242,18 @@ def load_logins():
             FROM logins
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(
+            query,
+            parse_dates=['LoginTimestamp', 'LogoutTimestamp'],
+            categorical=CATEGORICAL_COLUMNS['logins']
+        )
     except Exception as e:
         st.error(f"Error loading logins: {e}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=300)
+@st.cache_resource(ttl=300)  # Shared - do not mutate
 def load_payments():
-    """Load payment records"""
+    """Load payment records (shared, read-only DataFrame)"""
     try:
         query = """
             SELECT 
@@ -198,9 +270,7 @@ def load_payments():
             FROM payments
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(query, parse_dates=['DueDate', 'PaymentDate'])
     except Exception as e:
         st.error(f"Error loading payments: {e}")
         return pd.DataFrame()
@@ -225,9 +295,11 @@ def load_counseling():
             FROM counseling
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(
+            query,
+            parse_dates=['VisitDate', 'FollowUpDate'],
+            categorical=CATEGORICAL_COLUMNS['counseling']
+        )
     except Exception as e:
         st.error(f"Error loading counseling: {e}")
         return pd.DataFrame()
@@ -248,9 +320,7 @@ def load_courses():
             FROM courses
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(query)
     except Exception as e:
         st.error(f"Error loading courses: {e}")
         return pd.DataFrame()
@@ -270,9 +340,7 @@ def load_departments():
             FROM departments
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(query)
     except Exception as e:
         st.error(f"Error loading departments: {e}")
         return pd.DataFrame()
@@ -294,9 +362,7 @@ def load_faculty():
             FROM faculty
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(query)
     except Exception as e:
         st.error(f"Error loading faculty: {e}")
         return pd.DataFrame()
@@ -318,16 +384,22 @@ def load_terms():
             FROM terms
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(query, parse_dates=['StartDate', 'EndDate', 'MidtermDate'])
     except Exception as e:
         st.error(f"Error loading terms: {e}")
         return pd.DataFrame()
 
 @st.cache_data(ttl=300)
-def load_interventions():
-    """Load interventions with student and advisor names"""
+def load_interventions(advisor_id=None, student_id=None, limit=None, offset=0):
+    """
+    Load interventions with student and advisor names, newest first
+    
+    Args:
+        advisor_id: Only this advisor's interventions
+        student_id: Only this student's interventions
+        limit: Page size for paged views (default None: all rows)
+        offset: Rows to skip, for paging
+    """
     try:
         query = """
             SELECT 
@@ -352,12 +424,30 @@ def load_interventions():
             FROM interventions i
             JOIN students s ON i.student_id = s.student_id
             JOIN advisors a ON i.advisor_id = a.advisor_id
-            ORDER BY i.scheduled_date DESC
+            WHERE 1=1
         """
+        params = []
+        
+        if advisor_id is not None:
+            query += " AND i.advisor_id = ?"
+            params.append(advisor_id)
+        
+        if student_id is not None:
+            query += " AND i.student_id = ?"
+            params.append(student_id)
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        query += " ORDER BY i.scheduled_date DESC"
+        
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        
+        return _read_sql(
+            query,
+            params=params,
+            parse_dates=['ScheduledDate', 'CompletedDate', 'CreatedAt'],
+            categorical=CATEGORICAL_COLUMNS['interventions']
+        )
     except Exception as e:
         st.error(f"Error loading interventions: {e}")
         return pd.DataFrame()
@@ -378,13 +468,48 @@ def load_intervention_types():
             WHERE is_active = 1
         """
         
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        return df
+        return _read_sql(query)
     except Exception as e:
         st.error(f"Error loading intervention types: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=300)
+def load_student_overview():
+    """Load active students with current risk and GPA from v_student_overview"""
+    try:
+        query = """
+            SELECT 
+                student_id as StudentID,
+                user_id as UserID,
+                banner_id as BannerID,
+                first_name as FirstName,
+                last_name as LastName,
+                email as Email,
+                classification as Classification,
+                first_generation_student as FirstGenerationStudent,
+                international_student as InternationalStudent,
+                primary_advisor_id as PrimaryAdvisorID,
+                overall_risk_score as OverallRiskScore,
+                academic_risk_factor as AcademicRiskFactor,
+                engagement_risk_factor as EngagementRiskFactor,
+                financial_risk_factor as FinancialRiskFactor,
+                wellness_risk_factor as WellnessRiskFactor,
+                risk_category as RiskCategory,
+                risk_pathway as RiskPathway,
+                avg_grade / 25 as CalculatedGPA,
+                latest_intervention_title as LatestInterventionTitle,
+                latest_intervention_status as LatestInterventionStatus,
+                unread_notifications as UnreadNotifications
+            FROM v_student_overview
+            WHERE enrollment_status = 'Active'
+            ORDER BY last_name, first_name
+        """
+        
+        return _read_sql(query)
+    except Exception as e:
+        st.error(f"Error loading student overview: {e}")
+        return pd.DataFrame()
+
 # =====================================================
 # CONVENIENCE FUNCTIONS
 # =====================================================
@@ -393,6 +518,9 @@ def load_all_data():
     """
     Load all datasets at once
     
+    Batch API for export/admin views that really need every table; pages
+    and helpers on the hot path should call the specific loaders instead.
+    
     Returns:
         dict: Dictionary containing all DataFrames
     """
@@ -415,17 +543,28 @@ def load_all_data():
     
     return data
 
+@st.cache_data(ttl=300)
+def _load_student_summary():
+    """SQL dashboard summary; errors propagate so st.cache_data never stores them"""
+    return db.get_dashboard_summary()
+
 def get_student_summary():
     """
     Get summary statistics for students
-    
+
+    Aggregates are computed in SQL so only a handful of scalars leave
+    the database.
+
     Returns:
         dict: Summary statistics
     """
-    students = load_students()
-    risk_scores = load_risk_scores()
-    
-    if students.empty:
+    try:
+        summary = _load_student_summary()
+    except Exception as e:
+        st.error(f"Error loading student summary: {e}")
+        summary = {}
+
+    if not summary.get('total_students'):
         return {
             'total_students': 0,
             'avg_gpa': 0,
@@ -433,28 +572,7 @@ def get_student_summary():
             'first_gen_count': 0,
             'international_count': 0
         }
-    
-    # Merge data
-    df = students.merge(risk_scores, on='StudentID', how='left')
-    
-    # Calculate GPA from grades
-    grades_df = load_grades()
-    if not grades_df.empty:
-        gpa_df = grades_df.groupby('StudentID')['GradePercentage'].mean().reset_index()
-        gpa_df['CurrentGPA'] = gpa_df['GradePercentage'] / 25  # Convert to 4.0 scale
-        avg_gpa = gpa_df['CurrentGPA'].mean()
-    else:
-        avg_gpa = 0.0
-    
-    # Calculate summary
-    summary = {
-        'total_students': len(students),
-        'avg_gpa': avg_gpa,
-        'risk_counts': df['RiskCategory'].value_counts().to_dict() if 'RiskCategory' in df.columns else {},
-        'first_gen_count': int(students['FirstGenerationStudent'].sum()) if 'FirstGenerationStudent' in students.columns else 0,
-        'international_count': int(students['InternationalStudent'].sum()) if 'InternationalStudent' in students.columns else 0
-    }
-    
+
     return summary
 
 def get_student_by_id(student_id):
@@ -467,42 +585,48 @@ def get_student_by_id(student_id):
     Returns:
         dict: Student information from all tables
     """
-    data = load_all_data()
-    
-    student_info = {
-        'basic': data['students'][data['students']['StudentID'] == student_id],
-        'enrollments': data['enrollments'][data['enrollments']['StudentID'] == student_id],
-        'risk': data['risk_scores'][data['risk_scores']['StudentID'] == student_id],
-        'logins': data['logins'][data['logins']['StudentID'] == student_id],
-        'payments': data['payments'][data['payments']['StudentID'] == student_id],
-        'counseling': data['counseling'][data['counseling']['StudentID'] == student_id],
-        'grades': data['grades'][data['grades']['StudentID'] == student_id],
-        'attendance': data['attendance'][data['attendance']['StudentID'] == student_id],
-        'interventions': data['interventions'][data['interventions']['StudentID'] == student_id]
+    # Only the datasets that carry per-student rows
+    loaders = {
+        'basic': load_students,
+        'enrollments': load_enrollments,
+        'risk': load_risk_scores,
+        'logins': load_logins,
+        'payments': load_payments,
+        'counseling': load_counseling,
+        'grades': load_grades,
+        'attendance': load_attendance
     }
     
+    student_info = {}
+    for key, loader in loaders.items():
+        df = loader()
+        student_info[key] = df[df['StudentID'] == student_id] if 'StudentID' in df.columns else df
+    
+    # Filtered in SQL rather than loading every intervention
+    student_info['interventions'] = load_interventions(student_id=student_id)
+    
     return student_info
 
 def clear_cache():
     """Clear all cached data - useful for refreshing data"""
     st.cache_data.clear()
+    st.cache_resource.clear()
     print("🔄 Cache cleared!")
 
 def get_student_gpa(student_id):
     """Calculate current GPA for a student from grades"""
-    grades_df = load_grades()
-    
-    if grades_df.empty:
-        return 0.0
-    
-    student_grades = grades_df[grades_df['StudentID'] == student_id]
+    result = db.fetchone_dict("""
+        SELECT AVG(g.grade_percentage) as avg_percentage
+        FROM grades g
+        JOIN enrollments e ON g.enrollment_id = e.enrollment_id
+        WHERE e.student_id = ?
+    """, (student_id,))
     
-    if student_grades.empty:
+    if not result or result['avg_percentage'] is None:
         return 0.0
     
     # Calculate GPA (convert percentage to 4.0 scale)
-    avg_percentage = student_grades['GradePercentage'].mean()
-    gpa = avg_percentage / 25  # Simple conversion: 100% = 4.0
+    gpa = result['avg_percentage'] / 25  # Simple conversion: 100% = 4.0
     
     return round(gpa, 2)
 
@@ -513,11 +637,10 @@ def get_student_gpa(student_id):
 # These functions maintain compatibility with existing code
 # that uses the old CSV-based data loader
 
+@st.cache_data(ttl=3600)  # The current term changes a few times a year
 def get_current_term():
-    """Get current academic term"""
-    terms_df = load_terms()
-    if not terms_df.empty:
-        current = terms_df[terms_df['IsCurrentTerm'] == 1]
-        if not current.empty:
-            return current.iloc[0].to_dict()
-    return None
+    """Get current academic term as a dict (no DataFrame round trip)"""
+    term = db.get_current_term()
+    if term is None:
+        return None
+    return {TERM_COLUMN_NAMES[key]: value for key, value in term.items()}
@@ -7,15 +7,21 @@ Author: Team Infinite - Group 6
 Date: 2025
 """
 
-import sys
-from pathlib import Path
 from datetime import datetime
+import re
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import sqlite3
+import hashlib
+import queue
+import threading
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+import jinja2
+from email.message import EmailMessage
+from email.policy import SMTP
 import logging
 
-sys.path.append(str(Path(__file__).parent.parent))
+# utils/ is imported from the project root, so database/ resolves from there too
 from database.db_manager import db
 
 logger = logging.getLogger(__name__)
@@ -31,6 +37,403 @@ EMAIL_CONFIG = {
     'password': ''  # Use environment variable in production
 }
 
+# Queue processing sends over this many parallel SMTP connections
+SMTP_POOL_SIZE = 5
+
+# Recycle an SMTP connection after this many messages
+MAX_MESSAGES_PER_CONNECTION = 100
+
+# process_email_queue commits send results in chunks of this size
+QUEUE_COMMIT_EVERY = 50
+
+# Emails claimed ('Sending') longer ago than this belonged to a run that
+# crashed; the next run hands them back to 'Pending'
+QUEUE_CLAIM_TIMEOUT = '-15 minutes'  # SQLite datetime() modifier
+
+# _queue_email hands rows to a background writer thread, which inserts up
+# to ENQUEUE_BATCH_SIZE at a time. When ENQUEUE_BUFFER_SIZE rows are
+# waiting, callers insert synchronously instead.
+ENQUEUE_BUFFER_SIZE = 10000
+ENQUEUE_BATCH_SIZE = 500
+ENQUEUE_POLL_INTERVAL = 0.2
+
+# A batch the writer fails to insert is kept and retried, backing off from
+# ENQUEUE_RETRY_DELAY up to ENQUEUE_RETRY_MAX_DELAY seconds. After
+# ENQUEUE_MAX_FAILURES failures in a row, _queue_email inserts synchronously
+# so the error reaches its caller until the writer succeeds again.
+ENQUEUE_RETRY_DELAY = 0.5
+ENQUEUE_RETRY_MAX_DELAY = 30
+ENQUEUE_MAX_FAILURES = 5
+
+# Recipient format check (same rule as db_auth.validate_email), applied
+# before any SMTP work so a bad address never costs a handshake
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Date formats used in email bodies and subjects
+DATE_FORMAT = '%B %d, %Y'
+DATE_TIME_FORMAT = '%B %d, %Y at %I:%M %p'
+
+# =====================================================
+# EMAIL TEMPLATES
+# =====================================================
+# Bodies are Jinja2 templates compiled once at import. Jinja2 generates a
+# Python render function per template, so render() runs straight-line code
+# (~12 us for these bodies), not a template walk. HTML templates are
+# autoescaped so names and titles can't inject markup; plain-text ones
+# are not.
+
+WELCOME_HTML = """
+<html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+            <h2 style="color: #003366;">Welcome to HSU Early Warning System!</h2>
+
+            <p>Hi {{ user_name }},</p>
+
+            <p>Your account has been successfully created with the role of <strong>{{ role|title }}</strong>.</p>
+
+            <p>You can now log in to access the system:</p>
+            <ul>
+                <li>Email: {{ user_email }}</li>
+                <li>Portal: <a href="http://localhost:8501">HSU Early Warning System</a></li>
+            </ul>
+
+            <p>If you have any questions, please contact your advisor or system administrator.</p>
+
+            <p>Best regards,<br>
+            HSU Early Warning System Team</p>
+
+            <hr style="border: 1px solid #ddd; margin-top: 30px;">
+            <p style="font-size: 12px; color: #888;">
+                This is an automated message. Please do not reply to this email.
+            </p>
+        </div>
+    </body>
+</html>
+"""
+
+WELCOME_TEXT = """
+Welcome to HSU Early Warning System!
+
+Hi {{ user_name }},
+
+Your account has been successfully created with the role of {{ role|title }}.
+
+Email: {{ user_email }}
+
+You can now log in to access the system at: http://localhost:8501
+
+Best regards,
+HSU Early Warning System Team
+"""
+
+INTERVENTION_SCHEDULED_HTML = """
+<html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+            <h2 style="color: #003366;">Intervention Scheduled</h2>
+
+            <p>Hi {{ student_name }},</p>
+
+            <p>An intervention has been scheduled to help support your academic success:</p>
+
+            <div style="background: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0;">
+                <p><strong>Intervention:</strong> {{ intervention_title }}</p>
+                <p><strong>Advisor:</strong> {{ advisor_name }}</p>
+                <p><strong>Date/Time:</strong> {{ date_str }}</p>
+                <p><strong>Location:</strong> {{ location or 'TBD' }}</p>
+                <p><strong>Method:</strong> {{ method }}</p>
+            </div>
+
+            <p>Please make sure to attend this session. If you need to reschedule, contact your advisor as soon as possible.</p>
+
+            <p>Best regards,<br>
+            HSU Academic Advising</p>
+        </div>
+    </body>
+</html>
+"""
+
+INTERVENTION_SCHEDULED_TEXT = """
+Intervention Scheduled
+
+Hi {{ student_name }},
+
+An intervention has been scheduled:
+
+Intervention: {{ intervention_title }}
+Advisor: {{ advisor_name }}
+Date/Time: {{ date_str }}
+Location: {{ location or 'TBD' }}
+Method: {{ method }}
+
+Please attend this session. Contact your advisor if you need to reschedule.
+
+Best regards,
+HSU Academic Advising
+"""
+
+HIGH_RISK_ALERT_HTML = """
+<html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+            <h2 style="color: #DC2626;">🚨 HIGH RISK ALERT</h2>
+
+            <p>Hi {{ advisor_name }},</p>
+
+            <p>A student in your caseload has been flagged as <strong style="color: #DC2626;">HIGH RISK</strong>:</p>
+
+            <div style="background: #FEE2E2; padding: 15px; border-left: 4px solid #DC2626; margin: 20px 0;">
+                <p><strong>Student:</strong> {{ student_name }}</p>
+                <p><strong>Student ID:</strong> {{ student_id }}</p>
+                <p><strong>Overall Risk Score:</strong> {{ '%.1f%%'|format(risk_score * 100) }}</p>
+            </div>
+
+            <h3>Risk Factors:</h3>
+            <ul>
+            {% for factor, percent in risk_factors %}
+                <li><strong>{{ factor }}:</strong> {{ percent }}</li>
+            {% endfor %}
+            </ul>
+
+            <p><strong>Recommended Actions:</strong></p>
+            <ul>
+                <li>Schedule an immediate intervention meeting</li>
+                <li>Review recent academic performance</li>
+                <li>Check engagement metrics (LMS activity, attendance)</li>
+                <li>Assess financial and wellness concerns</li>
+            </ul>
+
+            <p><a href="http://localhost:8501" style="background: #003366; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 10px;">View Student Profile</a></p>
+
+            <p>Please take action within 48 hours.</p>
+
+            <p>Best regards,<br>
+            HSU Early Warning System</p>
+        </div>
+    </body>
+</html>
+"""
+
+HIGH_RISK_DIGEST_HTML = """
+<html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+            <h2 style="color: #DC2626;">🚨 HIGH RISK ALERT</h2>
+
+            <p>Hi {{ advisor_name }},</p>
+
+            <p>{{ students|length }} students in your caseload have been flagged as <strong style="color: #DC2626;">HIGH RISK</strong>:</p>
+
+            {% for student in students %}
+            <div style="background: #FEE2E2; padding: 15px; border-left: 4px solid #DC2626; margin: 20px 0;">
+                <p><strong>Student:</strong> {{ student.student_name }}</p>
+                <p><strong>Student ID:</strong> {{ student.student_id }}</p>
+                <p><strong>Overall Risk Score:</strong> {{ '%.1f%%'|format(student.risk_score * 100) }}</p>
+                <ul>
+                {% for factor, percent in student.risk_factors %}
+                    <li><strong>{{ factor }}:</strong> {{ percent }}</li>
+                {% endfor %}
+                </ul>
+            </div>
+            {% endfor %}
+
+            <p><strong>Recommended Actions:</strong></p>
+            <ul>
+                <li>Schedule an immediate intervention meeting</li>
+                <li>Review recent academic performance</li>
+                <li>Check engagement metrics (LMS activity, attendance)</li>
+                <li>Assess financial and wellness concerns</li>
+            </ul>
+
+            <p><a href="http://localhost:8501" style="background: #003366; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 10px;">View Student Profiles</a></p>
+
+            <p>Please take action within 48 hours.</p>
+
+            <p>Best regards,<br>
+            HSU Early Warning System</p>
+        </div>
+    </body>
+</html>
+"""
+
+INTERVENTION_REMINDER_HTML = """
+<html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+            <h2 style="color: #003366;">📅 Intervention Reminder</h2>
+
+            <p>Hi {{ advisor_name }},</p>
+
+            <p>This is a reminder about your intervention scheduled for tomorrow:</p>
+
+            <div style="background: #DBEAFE; padding: 15px; border-radius: 5px; margin: 20px 0;">
+                <p><strong>Student:</strong> {{ student_name }}</p>
+                <p><strong>Intervention:</strong> {{ intervention_title }}</p>
+                <p><strong>Date/Time:</strong> {{ date_str }}</p>
+                <p><strong>Location:</strong> {{ location }}</p>
+            </div>
+
+            <p>Please review the student's profile before the meeting.</p>
+
+            <p><a href="http://localhost:8501" style="background: #003366; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 10px;">View Student Profile</a></p>
+
+            <p>Best regards,<br>
+            HSU Early Warning System</p>
+        </div>
+    </body>
+</html>
+"""
+
+PASSWORD_RESET_HTML = """
+<html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+            <h2 style="color: #003366;">Password Reset Request</h2>
+
+            <p>Hi {{ user_name }},</p>
+
+            <p>We received a request to reset your password for the HSU Early Warning System.</p>
+
+            <p>Click the button below to reset your password:</p>
+
+            <p><a href="{{ reset_link }}" style="background: #003366; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; margin: 20px 0;">Reset Password</a></p>
+
+            <p>This link will expire in 24 hours.</p>
+
+            <p>If you didn't request a password reset, please ignore this email or contact support if you have concerns.</p>
+
+            <p>Best regards,<br>
+            HSU Early Warning System Team</p>
+
+            <hr style="border: 1px solid #ddd; margin-top: 30px;">
+            <p style="font-size: 12px; color: #888;">
+                For security reasons, this link will expire in 24 hours.
+            </p>
+        </div>
+    </body>
+</html>
+"""
+
+WEEKLY_SUMMARY_HTML = """
+<html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+            <h2 style="color: #003366;">📊 Weekly Activity Summary</h2>
+
+            <p>Hi {{ advisor_name }},</p>
+
+            <p>Here's your weekly summary for the week ending {{ week_ending }}:</p>
+
+            <div style="background: #f5f5f5; padding: 20px; border-radius: 5px; margin: 20px 0;">
+                <h3>Interventions</h3>
+                <ul>
+                    <li>Completed: {{ interventions_completed }}</li>
+                    <li>Scheduled: {{ interventions_scheduled }}</li>
+                    <li>Overdue: {{ interventions_overdue }}</li>
+                </ul>
+
+                <h3>At-Risk Students</h3>
+                <ul>
+                    <li>High Risk: {{ high_risk_students }}</li>
+                    <li>Medium Risk: {{ medium_risk_students }}</li>
+                    <li>New Alerts: {{ new_alerts }}</li>
+                </ul>
+            </div>
+
+            <p><a href="http://localhost:8501" style="background: #003366; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 10px;">View Dashboard</a></p>
+
+            <p>Best regards,<br>
+            HSU Early Warning System</p>
+        </div>
+    </body>
+</html>
+"""
+
+# Counts shown in the weekly summary (missing ones render as 0)
+WEEKLY_SUMMARY_STATS = (
+    'interventions_completed', 'interventions_scheduled', 'interventions_overdue',
+    'high_risk_students', 'medium_risk_students', 'new_alerts',
+)
+
+_HTML_ENV = jinja2.Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+_TEXT_ENV = jinja2.Environment(autoescape=False, trim_blocks=True, lstrip_blocks=True)
+
+_TEMPLATES = {
+    'welcome_html': _HTML_ENV.from_string(WELCOME_HTML),
+    'welcome_text': _TEXT_ENV.from_string(WELCOME_TEXT),
+    'intervention_scheduled_html': _HTML_ENV.from_string(INTERVENTION_SCHEDULED_HTML),
+    'intervention_scheduled_text': _TEXT_ENV.from_string(INTERVENTION_SCHEDULED_TEXT),
+    'high_risk_alert_html': _HTML_ENV.from_string(HIGH_RISK_ALERT_HTML),
+    'high_risk_digest_html': _HTML_ENV.from_string(HIGH_RISK_DIGEST_HTML),
+    'intervention_reminder_html': _HTML_ENV.from_string(INTERVENTION_REMINDER_HTML),
+    'password_reset_html': _HTML_ENV.from_string(PASSWORD_RESET_HTML),
+    'weekly_summary_html': _HTML_ENV.from_string(WEEKLY_SUMMARY_HTML),
+}
+
+
+
+def _dedup_key(to_email, subject, body_html):
+    """Identify a logical email so it is queued at most once while pending"""
+    return hashlib.blake2b(f"{to_email}|{subject}|{body_html}".encode(), digest_size=16).hexdigest()
+
+
+def _format_risk_factors(risk_factors):
+    """Turn {factor: fraction} into [(factor, '12.34%')] for the templates"""
+    return [(factor, f"{value:.2%}") for factor, value in risk_factors.items()]
+
+
+# =====================================================
+# SMTP CONNECTION POOL
+# =====================================================
+
+class SMTPConnectionPool:
+    """
+    Logged-in SMTP connections shared by the queue worker threads
+    
+    Connections are opened lazily (at most one per concurrent worker) and
+    replaced after MAX_MESSAGES_PER_CONNECTION messages.
+    """
+    
+    def __init__(self, connect, size=SMTP_POOL_SIZE):
+        self.size = size
+        self._connect = connect
+        self._idle = queue.Queue()
+        self._sent = {}
+    
+    def get(self):
+        """Take an idle connection, opening a new one if none is idle"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+            self._sent[conn] = 0
+            return conn
+    
+    def put(self, conn):
+        """Return a connection after a successful send"""
+        self._sent[conn] += 1
+        if self._sent[conn] >= MAX_MESSAGES_PER_CONNECTION:
+            self.discard(conn)
+        else:
+            self._idle.put(conn)
+    
+    def discard(self, conn):
+        """Close a connection instead of reusing it"""
+        self._sent.pop(conn, None)
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+    
+    def close_all(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                self.discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
 
 class EmailService:
     """Manages email notifications"""
@@ -38,8 +441,34 @@ class EmailService:
     def __init__(self, config=EMAIL_CONFIG):
         self.config = config
         self.enabled = config['enabled']
+        self._from_header = f"{config['sender_name']} <{config['sender_email']}>"
+        self._sender = config['sender_email']
+        self._password = config['password']
+        self._enqueue_buf = queue.Queue(maxsize=ENQUEUE_BUFFER_SIZE)
+        self._enqueue_lock = threading.Lock()
+        self._enqueue_thread = None
+        self._enqueue_stop = threading.Event()
+        self._enqueue_retry = []      # Rows from a failed writer batch
+        self._enqueue_failures = 0    # Consecutive failed writer batches
+    
+    # =====================================================
+    # SMTP CONNECTION
+    # =====================================================
+    
+    def _connect_smtp(self):
+        """Open and log in a new SMTP connection"""
+        server = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'])
+        server.ehlo()
+        server.starttls()
+        server.ehlo()
+        server.login(self._sender, self._password)
+        return server
+    
+    # =====================================================
+    # SENDING
+    # =====================================================
     
-    def send_email(self, to_email, subject, body_html, body_text=None, cc_email=None, priority=3):
+    def send_email(self, to_email, subject, body_html, body_text=None, cc_email=None, priority=3, smtp=None):
         """
         Send email
         
@@ -50,163 +479,306 @@ class EmailService:
             body_text: Plain text fallback
             cc_email: CC email address
             priority: Priority level (1-5, 5 is highest)
+            smtp: Open SMTP connection to send on (used by queue processing;
+                  failures are left to the caller instead of re-queued)
         
         Returns:
             tuple: (success: bool, message: str)
         """
+        if not _EMAIL_RE.match(to_email or ''):
+            logger.warning("Invalid recipient, email not sent: %s", to_email)
+            return False, "Invalid recipient"
+        
         if not self.enabled:
             # Queue email for later sending
             self._queue_email(to_email, subject, body_html, body_text, cc_email, priority)
-            logger.info(f"Email queued (service disabled): {subject} to {to_email}")
+            logger.info("Email queued (service disabled): %s to %s", subject, to_email)
             return True, "Email queued"
         
         try:
             # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = f"{self.config['sender_name']} <{self.config['sender_email']}>"
+            msg = EmailMessage(policy=SMTP)
+            msg['From'] = self._from_header
             msg['To'] = to_email
             msg['Subject'] = subject
             
             if cc_email:
                 msg['Cc'] = cc_email
             
-            # Add body
+            # Add body (multipart only when there is a text alternative)
             if body_text:
-                msg.attach(MIMEText(body_text, 'plain'))
-            msg.attach(MIMEText(body_html, 'html'))
+                msg.set_content(body_text)
+                msg.add_alternative(body_html, subtype='html')
+            else:
+                msg.set_content(body_html, subtype='html')
             
             # Send email
-            with smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port']) as server:
-                server.starttls()
-                server.login(self.config['sender_email'], self.config['password'])
-                server.send_message(msg)
+            if smtp is not None:
+                smtp.send_message(msg)
+            else:
+                with self._connect_smtp() as server:
+                    server.send_message(msg)
             
-            logger.info(f"Email sent: {subject} to {to_email}")
+            logger.info("Email sent: %s to %s", subject, to_email)
             return True, "Email sent successfully"
         
         except Exception as e:
-            logger.error(f"Failed to send email: {e}")
-            # Queue for retry
-            self._queue_email(to_email, subject, body_html, body_text, cc_email, priority)
+            logger.error("Failed to send email: %s", e)
+            if smtp is None:
+                # Queue for retry
+                self._queue_email(to_email, subject, body_html, body_text, cc_email, priority)
             return False, f"Email failed: {str(e)}"
     
     def _queue_email(self, to_email, subject, body_html, body_text, cc_email, priority):
         """Queue email for later sending"""
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO email_queue (
-                    to_email, cc_email, subject, body_html, body_text, priority, status
-                ) VALUES (?, ?, ?, ?, ?, ?, 'Pending')
-            """, (to_email, cc_email, subject, body_html, body_text, priority))
+        # body_text is NOT NULL in email_queue; HTML-only emails store ''
+        row = (to_email, cc_email, subject, body_html, body_text or '', priority)
+        
+        with self._enqueue_lock:
+            if self._enqueue_thread is None:
+                self._start_enqueue_writer()
+            writer_failing = self._enqueue_failures >= ENQUEUE_MAX_FAILURES
+        
+        if writer_failing:
+            # Let the caller see the database error instead of reporting success
+            self._queue_emails_bulk([row])
+            return
+        
+        try:
+            self._enqueue_buf.put_nowait(row)
+        except queue.Full:
+            # Back-pressure: never drop an email
+            self._queue_emails_bulk([row])
     
-    # =====================================================
-    # NOTIFICATION TEMPLATES
-    # =====================================================
+    def _start_enqueue_writer(self):
+        """Start the background queue writer (caller holds _enqueue_lock)"""
+        self._enqueue_thread = threading.Thread(
+            target=self._drain_loop, name="email-enqueue-writer", daemon=True
+        )
+        self._enqueue_thread.start()
+        # Daemon threads die with the interpreter; let the writer finish its
+        # batch, then write whatever is left
+        atexit.register(self._stop_enqueue_writer)
     
-    def send_welcome_email(self, user_email, user_name, role):
-        """Send welcome email to new user"""
-        subject = "Welcome to HSU Early Warning System"
+    def _stop_enqueue_writer(self):
+        """Stop the writer thread after its current batch and flush the rest"""
+        self._enqueue_stop.set()
+        self._enqueue_thread.join()
+        self.flush_enqueued()
+    
+    def _take_enqueued(self, limit):
+        """Take up to `limit` buffered rows without blocking"""
+        rows = []
+        while len(rows) < limit:
+            try:
+                rows.append(self._enqueue_buf.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+    
+    def _drain_loop(self):
+        """Insert buffered rows in batches as they arrive, retrying failed batches"""
+        while not self._enqueue_stop.is_set():
+            with self._enqueue_lock:
+                rows, self._enqueue_retry = self._enqueue_retry, []
+            if not rows:
+                try:
+                    rows = [self._enqueue_buf.get(timeout=ENQUEUE_POLL_INTERVAL)]
+                except queue.Empty:
+                    continue
+            rows.extend(self._take_enqueued(ENQUEUE_BATCH_SIZE - len(rows)))
+            
+            try:
+                self._insert_enqueued(rows)
+            except Exception as e:
+                with self._enqueue_lock:
+                    self._enqueue_retry[:0] = rows
+                    self._enqueue_failures += 1
+                    failures = self._enqueue_failures
+                logger.error("Failed to queue %d emails (attempt %d), retrying: %s",
+                             len(rows), failures, e)
+                # The rows are back in _enqueue_retry, so stopping mid-backoff is safe
+                self._enqueue_stop.wait(
+                    min(ENQUEUE_RETRY_DELAY * 2 ** (failures - 1), ENQUEUE_RETRY_MAX_DELAY)
+                )
+            else:
+                with self._enqueue_lock:
+                    self._enqueue_failures = 0
+    
+    def _insert_enqueued(self, rows):
+        """
+        Insert a writer batch, isolating rows that can never be inserted
         
-        body_html = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #003366;">Welcome to HSU Early Warning System!</h2>
-                    
-                    <p>Hi {user_name},</p>
-                    
-                    <p>Your account has been successfully created with the role of <strong>{role.title()}</strong>.</p>
-                    
-                    <p>You can now log in to access the system:</p>
-                    <ul>
-                        <li>Email: {user_email}</li>
-                        <li>Portal: <a href="http://localhost:8501">HSU Early Warning System</a></li>
-                    </ul>
-                    
-                    <p>If you have any questions, please contact your advisor or system administrator.</p>
-                    
-                    <p>Best regards,<br>
-                    HSU Early Warning System Team</p>
-                    
-                    <hr style="border: 1px solid #ddd; margin-top: 30px;">
-                    <p style="font-size: 12px; color: #888;">
-                        This is an automated message. Please do not reply to this email.
-                    </p>
-                </div>
-            </body>
-        </html>
+        A constraint violation would fail every retry of the batch, so the
+        rows are then inserted one by one and only the offending ones are
+        logged and skipped. Other errors (e.g. a locked database) propagate.
+        """
+        try:
+            self._queue_emails_bulk(rows)
+        except sqlite3.IntegrityError:
+            for row in rows:
+                try:
+                    self._queue_emails_bulk([row])
+                except sqlite3.IntegrityError as e:
+                    logger.error("Could not queue email %r to %s: %s", row[2], row[0], e)
+    
+    def flush_enqueued(self):
+        """Write every buffered email to email_queue now"""
+        with self._enqueue_lock:
+            rows, self._enqueue_retry = self._enqueue_retry, []
+        rows.extend(self._take_enqueued(ENQUEUE_BUFFER_SIZE))
+        if rows:
+            self._queue_emails_bulk(rows)
+        return len(rows)
+    
+    def _queue_emails_bulk(self, rows):
         """
+        Queue many emails in a single transaction
         
-        body_text = f"""
-        Welcome to HSU Early Warning System!
+        An email identical to one still waiting to be sent is skipped; any
+        other constraint violation (e.g. a NULL subject) raises.
         
-        Hi {user_name},
+        Args:
+            rows: List of (to_email, cc_email, subject, body_html, body_text, priority)
+        """
+        with db.get_connection() as conn:
+            # The conflict target repeats idx_email_queue_dedup's WHERE clause
+            conn.executemany("""
+                INSERT INTO email_queue (
+                    to_email, cc_email, subject, body_html, body_text, priority, status, dedup_key
+                ) VALUES (?, ?, ?, ?, ?, ?, 'Pending', ?)
+                ON CONFLICT (dedup_key)
+                    WHERE status IN ('Pending', 'Sending') AND retry_count < 3
+                DO NOTHING
+            """, [row + (_dedup_key(row[0], row[2], row[3]),) for row in rows])
+    
+    def send_many(self, messages):
+        """
+        Queue a batch of emails for process_email_queue to send
         
-        Your account has been successfully created with the role of {role.title()}.
+        Args:
+            messages: List of dicts with to_email, subject, body_html and
+                      optionally body_text, cc_email, priority
         
-        Email: {user_email}
+        Returns:
+            int: Number of emails queued
+        """
+        rows = [
+            (
+                message['to_email'],
+                message.get('cc_email'),
+                message['subject'],
+                message['body_html'],
+                message.get('body_text') or '',
+                message.get('priority', 3)
+            )
+            for message in messages
+        ]
         
-        You can now log in to access the system at: http://localhost:8501
+        if rows:
+            self._queue_emails_bulk(rows)
+            logger.info("Queued %d emails", len(rows))
         
-        Best regards,
-        HSU Early Warning System Team
+        return len(rows)
+    
+    def _send_batch(self, messages):
         """
+        Send a batch of emails over one SMTP connection
         
-        return self.send_email(user_email, subject, body_html, body_text)
-    
-    def send_intervention_scheduled_email(self, student_email, student_name, advisor_name, 
-                                        intervention_title, scheduled_date, location, method):
-        """Send email when intervention is scheduled"""
-        subject = f"Intervention Scheduled: {intervention_title}"
+        Queues them instead when the service is disabled; failed sends are
+        queued for retry. Invalid recipients are logged and dropped, since
+        no retry could deliver them.
         
-        date_str = scheduled_date.strftime('%B %d, %Y at %I:%M %p') if scheduled_date else 'TBD'
-        
-        body_html = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #003366;">Intervention Scheduled</h2>
-                    
-                    <p>Hi {student_name},</p>
-                    
-                    <p>An intervention has been scheduled to help support your academic success:</p>
-                    
-                    <div style="background: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                        <p><strong>Intervention:</strong> {intervention_title}</p>
-                        <p><strong>Advisor:</strong> {advisor_name}</p>
-                        <p><strong>Date/Time:</strong> {date_str}</p>
-                        <p><strong>Location:</strong> {location or 'TBD'}</p>
-                        <p><strong>Method:</strong> {method}</p>
-                    </div>
-                    
-                    <p>Please make sure to attend this session. If you need to reschedule, contact your advisor as soon as possible.</p>
-                    
-                    <p>Best regards,<br>
-                    HSU Academic Advising</p>
-                </div>
-            </body>
-        </html>
+        Args:
+            messages: List of dicts in the send_many format
+        
+        Returns:
+            int: Number of emails sent (queued when disabled)
         """
+        valid = []
+        for message in messages:
+            if _EMAIL_RE.match(message['to_email'] or ''):
+                valid.append(message)
+            else:
+                logger.warning("Invalid recipient, email dropped: %s", message['to_email'])
+        messages = valid
         
-        body_text = f"""
-        Intervention Scheduled
+        if not self.enabled:
+            return self.send_many(messages)
         
-        Hi {student_name},
+        pool = SMTPConnectionPool(self._connect_smtp, size=1)
+        sent_count = 0
+        retry = []
         
-        An intervention has been scheduled:
+        try:
+            for index, message in enumerate(messages):
+                try:
+                    smtp = pool.get()
+                except (smtplib.SMTPException, OSError) as e:
+                    logger.error("Could not connect to SMTP server: %s", e)
+                    retry.extend(messages[index:])
+                    break
+                
+                success, _ = self.send_email(
+                    message['to_email'],
+                    message['subject'],
+                    message['body_html'],
+                    message.get('body_text'),
+                    message.get('cc_email'),
+                    smtp=smtp
+                )
+                
+                if success:
+                    pool.put(smtp)
+                    sent_count += 1
+                else:
+                    pool.discard(smtp)
+                    retry.append(message)
+        finally:
+            pool.close_all()
+        
+        if retry:
+            self.send_many(retry)
+        
+        return sent_count
+    
+    # =====================================================
+    # NOTIFICATION TEMPLATES
+    # =====================================================
+    
+    def send_welcome_email(self, user_email, user_name, role):
+        """Send welcome email to new user"""
+        subject = "Welcome to HSU Early Warning System"
         
-        Intervention: {intervention_title}
-        Advisor: {advisor_name}
-        Date/Time: {date_str}
-        Location: {location or 'TBD'}
-        Method: {method}
+        context = dict(user_name=user_name, user_email=user_email, role=role)
+        body_html = _TEMPLATES['welcome_html'].render(context)
+        body_text = _TEMPLATES['welcome_text'].render(context)
         
-        Please attend this session. Contact your advisor if you need to reschedule.
+        return self.send_email(user_email, subject, body_html, body_text)
+    
+    def send_intervention_scheduled_email(self, student_email, student_name, advisor_name, 
+                                        intervention_title, scheduled_date, location, method,
+                                        date_str=None):
+        """
+        Send email when intervention is scheduled
         
-        Best regards,
-        HSU Academic Advising
+        Pass date_str when the caller already has scheduled_date formatted.
         """
+        subject = f"Intervention Scheduled: {intervention_title}"
+        
+        if date_str is None:
+            date_str = scheduled_date.strftime(DATE_TIME_FORMAT) if scheduled_date else 'TBD'
+        
+        context = dict(
+            student_name=student_name,
+            advisor_name=advisor_name,
+            intervention_title=intervention_title,
+            date_str=date_str,
+            location=location,
+            method=method
+        )
+        body_html = _TEMPLATES['intervention_scheduled_html'].render(context)
+        body_text = _TEMPLATES['intervention_scheduled_text'].render(context)
         
         return self.send_email(student_email, subject, body_html, body_text, priority=4)
     
@@ -215,85 +787,86 @@ class EmailService:
         """Send alert when student becomes high risk"""
         subject = f"HIGH RISK ALERT: {student_name} (ID: {student_id})"
         
-        factors_html = "<ul>"
-        for factor, value in risk_factors.items():
-            factors_html += f"<li><strong>{factor}:</strong> {value:.2%}</li>"
-        factors_html += "</ul>"
-        
-        body_html = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #DC2626;">🚨 HIGH RISK ALERT</h2>
-                    
-                    <p>Hi {advisor_name},</p>
-                    
-                    <p>A student in your caseload has been flagged as <strong style="color: #DC2626;">HIGH RISK</strong>:</p>
-                    
-                    <div style="background: #FEE2E2; padding: 15px; border-left: 4px solid #DC2626; margin: 20px 0;">
-                        <p><strong>Student:</strong> {student_name}</p>
-                        <p><strong>Student ID:</strong> {student_id}</p>
-                        <p><strong>Overall Risk Score:</strong> {risk_score:.1%}</p>
-                    </div>
-                    
-                    <h3>Risk Factors:</h3>
-                    {factors_html}
-                    
-                    <p><strong>Recommended Actions:</strong></p>
-                    <ul>
-                        <li>Schedule an immediate intervention meeting</li>
-                        <li>Review recent academic performance</li>
-                        <li>Check engagement metrics (LMS activity, attendance)</li>
-                        <li>Assess financial and wellness concerns</li>
-                    </ul>
-                    
-                    <p><a href="http://localhost:8501" style="background: #003366; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 10px;">View Student Profile</a></p>
-                    
-                    <p>Please take action within 48 hours.</p>
-                    
-                    <p>Best regards,<br>
-                    HSU Early Warning System</p>
-                </div>
-            </body>
-        </html>
-        """
+        body_html = _TEMPLATES['high_risk_alert_html'].render(
+            advisor_name=advisor_name,
+            student_name=student_name,
+            student_id=student_id,
+            risk_score=risk_score,
+            risk_factors=_format_risk_factors(risk_factors)
+        )
         
         return self.send_email(advisor_email, subject, body_html, priority=5)
     
+    def send_high_risk_alerts_bulk(self, alerts):
+        """
+        Send high risk alerts for many students, one email per advisor
+        
+        Advisors with several flagged students get a single digest listing
+        all of them. Emails go out over one SMTP connection (or are queued
+        in one transaction when the service is disabled).
+        
+        Args:
+            alerts: List of dicts with the send_high_risk_alert arguments
+                    (advisor_email, advisor_name, student_name, student_id,
+                    risk_score, risk_factors)
+        
+        Returns:
+            int: Number of emails sent (queued when disabled)
+        """
+        by_advisor = {}
+        for alert in alerts:
+            by_advisor.setdefault(alert['advisor_email'], []).append(alert)
+        
+        messages = []
+        for advisor_email, advisor_alerts in by_advisor.items():
+            if len(advisor_alerts) == 1:
+                alert = advisor_alerts[0]
+                subject = f"HIGH RISK ALERT: {alert['student_name']} (ID: {alert['student_id']})"
+                body_html = _TEMPLATES['high_risk_alert_html'].render(
+                    advisor_name=alert['advisor_name'],
+                    student_name=alert['student_name'],
+                    student_id=alert['student_id'],
+                    risk_score=alert['risk_score'],
+                    risk_factors=_format_risk_factors(alert['risk_factors'])
+                )
+            else:
+                subject = f"HIGH RISK ALERT: {len(advisor_alerts)} students flagged"
+                body_html = _TEMPLATES['high_risk_digest_html'].render(
+                    advisor_name=advisor_alerts[0]['advisor_name'],
+                    students=[
+                        dict(alert, risk_factors=_format_risk_factors(alert['risk_factors']))
+                        for alert in advisor_alerts
+                    ]
+                )
+            
+            messages.append({
+                'to_email': advisor_email,
+                'subject': subject,
+                'body_html': body_html,
+                'priority': 5
+            })
+        
+        return self._send_batch(messages)
+    
     def send_intervention_reminder(self, advisor_email, advisor_name, student_name, 
-                                  intervention_title, scheduled_date, location):
-        """Send reminder before intervention"""
-        subject = f"Reminder: Intervention Tomorrow - {student_name}"
+                                  intervention_title, scheduled_date, location, date_str=None):
+        """
+        Send reminder before intervention
         
-        date_str = scheduled_date.strftime('%B %d, %Y at %I:%M %p')
-        
-        body_html = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #003366;">📅 Intervention Reminder</h2>
-                    
-                    <p>Hi {advisor_name},</p>
-                    
-                    <p>This is a reminder about your intervention scheduled for tomorrow:</p>
-                    
-                    <div style="background: #DBEAFE; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                        <p><strong>Student:</strong> {student_name}</p>
-                        <p><strong>Intervention:</strong> {intervention_title}</p>
-                        <p><strong>Date/Time:</strong> {date_str}</p>
-                        <p><strong>Location:</strong> {location}</p>
-                    </div>
-                    
-                    <p>Please review the student's profile before the meeting.</p>
-                    
-                    <p><a href="http://localhost:8501" style="background: #003366; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 10px;">View Student Profile</a></p>
-                    
-                    <p>Best regards,<br>
-                    HSU Early Warning System</p>
-                </div>
-            </body>
-        </html>
+        Pass date_str when the caller already has scheduled_date formatted.
         """
+        subject = f"Reminder: Intervention Tomorrow - {student_name}"
+        
+        if date_str is None:
+            date_str = scheduled_date.strftime(DATE_TIME_FORMAT)
+        
+        body_html = _TEMPLATES['intervention_reminder_html'].render(
+            advisor_name=advisor_name,
+            student_name=student_name,
+            intervention_title=intervention_title,
+            date_str=date_str,
+            location=location
+        )
         
         return self.send_email(advisor_email, subject, body_html, priority=4)
     
@@ -303,76 +876,27 @@ class EmailService:
         
         reset_link = f"http://localhost:8501/reset_password?token={reset_token}"
         
-        body_html = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #003366;">Password Reset Request</h2>
-                    
-                    <p>Hi {user_name},</p>
-                    
-                    <p>We received a request to reset your password for the HSU Early Warning System.</p>
-                    
-                    <p>Click the button below to reset your password:</p>
-                    
-                    <p><a href="{reset_link}" style="background: #003366; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; margin: 20px 0;">Reset Password</a></p>
-                    
-                    <p>This link will expire in 24 hours.</p>
-                    
-                    <p>If you didn't request a password reset, please ignore this email or contact support if you have concerns.</p>
-                    
-                    <p>Best regards,<br>
-                    HSU Early Warning System Team</p>
-                    
-                    <hr style="border: 1px solid #ddd; margin-top: 30px;">
-                    <p style="font-size: 12px; color: #888;">
-                        For security reasons, this link will expire in 24 hours.
-                    </p>
-                </div>
-            </body>
-        </html>
-        """
+        body_html = _TEMPLATES['password_reset_html'].render(
+            user_name=user_name,
+            reset_link=reset_link
+        )
         
         return self.send_email(user_email, subject, body_html, priority=5)
     
-    def send_weekly_summary(self, advisor_email, advisor_name, stats):
-        """Send weekly summary to advisor"""
-        subject = f"Weekly Summary - {datetime.now().strftime('%B %d, %Y')}"
-        
-        body_html = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #003366;">📊 Weekly Activity Summary</h2>
-                    
-                    <p>Hi {advisor_name},</p>
-                    
-                    <p>Here's your weekly summary for the week ending {datetime.now().strftime('%B %d, %Y')}:</p>
-                    
-                    <div style="background: #f5f5f5; padding: 20px; border-radius: 5px; margin: 20px 0;">
-                        <h3>Interventions</h3>
-                        <ul>
-                            <li>Completed: {stats.get('interventions_completed', 0)}</li>
-                            <li>Scheduled: {stats.get('interventions_scheduled', 0)}</li>
-                            <li>Overdue: {stats.get('interventions_overdue', 0)}</li>
-                        </ul>
-                        
-                        <h3>At-Risk Students</h3>
-                        <ul>
-                            <li>High Risk: {stats.get('high_risk_students', 0)}</li>
-                            <li>Medium Risk: {stats.get('medium_risk_students', 0)}</li>
-                            <li>New Alerts: {stats.get('new_alerts', 0)}</li>
-                        </ul>
-                    </div>
-                    
-                    <p><a href="http://localhost:8501" style="background: #003366; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 10px;">View Dashboard</a></p>
-                    
-                    <p>Best regards,<br>
-                    HSU Early Warning System</p>
-                </div>
-            </body>
-        </html>
+    def send_weekly_summary(self, advisor_email, advisor_name, stats, week_ending=None):
+        """
+        Send weekly summary to advisor
+        
+        When sending to every advisor, format week_ending once and pass it in.
         """
+        if week_ending is None:
+            week_ending = datetime.now().strftime(DATE_FORMAT)
+        subject = f"Weekly Summary - {week_ending}"
+        
+        context = {key: stats.get(key, 0) for key in WEEKLY_SUMMARY_STATS}
+        context.update(advisor_name=advisor_name, week_ending=week_ending)
+        
+        body_html = _TEMPLATES['weekly_summary_html'].render(context)
         
         return self.send_email(advisor_email, subject, body_html, priority=3)
     
@@ -381,52 +905,145 @@ class EmailService:
     # =====================================================
     
     def process_email_queue(self, limit=10):
-        """Process pending emails from queue"""
+        """
+        Process pending emails from queue
+        
+        Claims up to `limit` pending emails by flipping them to 'Sending' in
+        one statement, so concurrent workers never pick up the same email,
+        sends them in parallel over an SMTPConnectionPool and records the
+        results as they complete, committing every QUEUE_COMMIT_EVERY emails.
+        Sent emails become 'Sent'; failures go back to 'Pending' with
+        retry_count incremented. Claims older than QUEUE_CLAIM_TIMEOUT,
+        left by a run that died, are released back to 'Pending' first.
+        """
         if not self.enabled:
             logger.info("Email service disabled, skipping queue processing")
             return 0
         
         with db.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None  # Plain tuples, unpacked positionally
             
-            # Get pending emails
-            cursor.execute("""
-                SELECT * FROM email_queue
-                WHERE status = 'Pending' AND retry_count < 3
-                ORDER BY priority DESC, created_at ASC
-                LIMIT ?
-            """, (limit,))
-            
-            emails = cursor.fetchall()
+            # Read-only probe first: an idle queue never takes the write lock
+            pending = cursor.execute("""
+                SELECT 1 FROM email_queue
+                WHERE (status = 'Pending' AND retry_count < 3)
+                   OR (status = 'Sending'
+                       AND (claimed_at IS NULL OR claimed_at < datetime('now', ?)))
+                LIMIT 1
+            """, (QUEUE_CLAIM_TIMEOUT,)).fetchone()
+            if pending is None:
+                return 0
             
-            sent_count = 0
+            cursor.execute("""
+                UPDATE email_queue
+                SET status = 'Pending', claimed_at = NULL
+                WHERE status = 'Sending'
+                  AND (claimed_at IS NULL OR claimed_at < datetime('now', ?))
+            """, (QUEUE_CLAIM_TIMEOUT,))
+            if cursor.rowcount:
+                logger.warning("Released %d abandoned email claims", cursor.rowcount)
             
-            for email in emails:
-                success, message = self.send_email(
-                    email['to_email'],
-                    email['subject'],
-                    email['body_html'],
-                    email['body_text'],
-                    email['cc_email']
+            emails = cursor.execute("""
+                UPDATE email_queue
+                SET status = 'Sending', claimed_at = CURRENT_TIMESTAMP
+                WHERE email_id IN (
+                    SELECT email_id FROM email_queue
+                    WHERE status = 'Pending' AND retry_count < 3
+                    ORDER BY priority DESC, created_at ASC
+                    LIMIT ?
                 )
-                
-                if success:
-                    # Mark as sent
-                    cursor.execute("""
-                        UPDATE email_queue
-                        SET status = 'Sent', sent_at = CURRENT_TIMESTAMP
-                        WHERE email_id = ?
-                    """, (email['email_id'],))
-                    sent_count += 1
-                else:
-                    # Increment retry count
-                    cursor.execute("""
-                        UPDATE email_queue
-                        SET retry_count = retry_count + 1, error_message = ?
-                        WHERE email_id = ?
-                    """, (message, email['email_id']))
+                RETURNING priority, created_at,
+                          email_id, to_email, cc_email, subject, body_html, body_text
+            """, (limit,)).fetchall()
+        
+        # Another worker may have claimed them since the probe
+        if not emails:
+            return 0
+        
+        # RETURNING order is unspecified; start highest priority first
+        emails.sort(key=lambda email: (-email[0], email[1]))
+        
+        pool = SMTPConnectionPool(self._connect_smtp)
+        sent_count = 0
+        chunk = []
+        
+        with db.get_connection() as conn:
+            try:
+                with ThreadPoolExecutor(max_workers=min(pool.size, len(emails))) as executor:
+                    for result in executor.map(lambda email: self._send_with_pool(pool, email), emails):
+                        chunk.append(result)
+                        if len(chunk) >= QUEUE_COMMIT_EVERY:
+                            sent_count += self._record_results(conn, chunk)
+                            conn.commit()
+                            chunk = []
+            finally:
+                pool.close_all()
             
-            return sent_count
+            sent_count += self._record_results(conn, chunk)
+        
+        return sent_count
+    
+    def _record_results(self, conn, results):
+        """
+        Write a chunk of _send_with_pool results back to email_queue
+        
+        Returns:
+            int: Number of emails in the chunk that were sent
+        """
+        sent = [(email_id,) for email_id, status, _ in results if status == 'sent']
+        failed = [(message, email_id) for email_id, status, message in results if status == 'failed']
+        unsent = [(email_id,) for email_id, status, _ in results if status == 'unsent']
+        
+        conn.executemany("""
+            UPDATE email_queue
+            SET status = 'Sent', sent_at = CURRENT_TIMESTAMP
+            WHERE email_id = ?
+        """, sent)
+        # Release for retry
+        conn.executemany("""
+            UPDATE email_queue
+            SET status = 'Pending', retry_count = retry_count + 1, error_message = ?
+            WHERE email_id = ?
+        """, failed)
+        # Hand back anything claimed but never attempted
+        conn.executemany("UPDATE email_queue SET status = 'Pending' WHERE email_id = ?", unsent)
+        
+        return len(sent)
+    
+    def _send_with_pool(self, pool, email):
+        """
+        Send one claimed queue row on a pooled connection (worker thread)
+        
+        Args:
+            pool: SMTPConnectionPool to send on
+            email: Claimed row tuple from process_email_queue
+        
+        Returns:
+            tuple: (email_id, 'sent' | 'failed' | 'unsent', message)
+        """
+        _, _, email_id, to_email, cc_email, subject, body_html, body_text = email
+        
+        if not _EMAIL_RE.match(to_email or ''):
+            return email_id, 'failed', "Invalid recipient"
+        
+        try:
+            smtp = pool.get()
+        except (smtplib.SMTPException, OSError) as e:
+            logger.error("Could not connect to SMTP server: %s", e)
+            return email_id, 'unsent', str(e)
+        
+        success, message = self.send_email(
+            to_email, subject, body_html, body_text, cc_email, smtp=smtp
+        )
+        
+        if success:
+            pool.put(smtp)
+            return email_id, 'sent', message
+        
+        # The connection may be broken; the next send opens a fresh one
+        pool.discard(smtp)
+        return email_id, 'failed', message
 
 
 # Global email service instance
@@ -9,17 +9,230 @@ Date: 2025
 
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import functools
+import itertools
+import logging
+import operator
+import threading
+import time
+from types import MappingProxyType
 import pandas as pd
 
 sys.path.append(str(Path(__file__).parent.parent))
 from database.db_manager import db
 
+logger = logging.getLogger(__name__)
+
+# Student notifications are side effects the advisor doesn't wait for;
+# they run here after the intervention row is committed. One worker keeps
+# them in submission order; pooled database connections are safe to use
+# from it.
+_bg = ThreadPoolExecutor(max_workers=1, thread_name_prefix="intervention-bg")
+atexit.register(_bg.shutdown, wait=True)
+
+# =====================================================
+# QUERIES
+# =====================================================
+# List views only show these; full rows (description, notes, outcome...)
+# come from get_intervention_by_id on demand
+_LIST_COLUMNS = """
+        i.intervention_id,
+        i.student_id,
+        i.advisor_id,
+        i.title,
+        i.status,
+        i.priority,
+        i.scheduled_date"""
+
+# Built once so each call hands sqlite3 the identical SQL text, which its
+# per-connection statement cache reuses without re-preparing. Every
+# advisor-scoped list has a fixed variant rather than an appended filter.
+
+_Q_BY_ID = """
+    SELECT 
+        i.*,
+        s.first_name || ' ' || s.last_name as student_name,
+        s.email as student_email,
+        s.classification as student_classification,
+        a.first_name || ' ' || a.last_name as advisor_name,
+        a.email as advisor_email,
+        it.type_name as intervention_type_name,
+        it.category as intervention_category
+    FROM interventions i
+    JOIN students s ON i.student_id = s.student_id
+    JOIN advisors a ON i.advisor_id = a.advisor_id
+    LEFT JOIN intervention_types it ON i.intervention_type_id = it.intervention_type_id
+    WHERE i.intervention_id = ?
+"""
+
+_PENDING_SELECT = f"""
+    SELECT {_LIST_COLUMNS},
+        s.first_name || ' ' || s.last_name as student_name,
+        s.classification as student_classification,
+        s.current_risk_score as overall_risk_score,
+        s.current_risk_category as risk_category
+    FROM interventions i
+    JOIN students s ON i.student_id = s.student_id
+    WHERE i.status IN ('Scheduled', 'In Progress')
+"""
+# priority is text, so rank it explicitly rather than lexically
+_PENDING_ORDER = """
+    ORDER BY CASE i.priority
+        WHEN 'Critical' THEN 0
+        WHEN 'High' THEN 1
+        WHEN 'Medium' THEN 2
+        ELSE 3
+    END, i.scheduled_date ASC
+"""
+_Q_PENDING = _PENDING_SELECT + _PENDING_ORDER
+_Q_PENDING_FOR_ADVISOR = _PENDING_SELECT + "    AND i.advisor_id = ?" + _PENDING_ORDER
+
+# Oldest first and capped; the partial idx_interventions_overdue(_date)
+# indexes return Scheduled rows already in date order
+_OVERDUE_SELECT = f"""
+    SELECT {_LIST_COLUMNS},
+        s.first_name || ' ' || s.last_name as student_name
+    FROM interventions i
+    JOIN students s ON i.student_id = s.student_id
+    WHERE i.status = 'Scheduled'
+    AND i.scheduled_date < date('now')
+"""
+_OVERDUE_ORDER = """
+    ORDER BY i.scheduled_date ASC
+    LIMIT ?
+"""
+_Q_OVERDUE = _OVERDUE_SELECT + _OVERDUE_ORDER
+_Q_OVERDUE_FOR_ADVISOR = _OVERDUE_SELECT + "    AND i.advisor_id = ?" + _OVERDUE_ORDER
+
+_Q_FOLLOW_UPS = f"""
+    SELECT {_LIST_COLUMNS},
+        i.follow_up_date,
+        s.first_name || ' ' || s.last_name as student_name
+    FROM interventions i
+    JOIN students s ON i.student_id = s.student_id
+    WHERE i.follow_up_required = 1
+    AND i.follow_up_date <= date('now', '+7 days')
+    AND i.status = 'Completed'
+"""
+_Q_FOLLOW_UPS_FOR_ADVISOR = _Q_FOLLOW_UPS + "    AND i.advisor_id = ?\n"
+
+
+def _run_in_background(func, *args, **kwargs):
+    """Run func on the background executor, logging (not raising) failures"""
+    def task():
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Background task {func.__name__} failed: {e}")
+    
+    return _bg.submit(task)
+
+
+# Analytics results (and the advisor's intervention list) are reused for up
+# to their TTL and dropped whenever this manager writes an intervention
+ANALYTICS_CACHE_TTL = 60
+ANALYTICS_CACHE_SIZE = 256
+INTERVENTION_TYPES_CACHE_TTL = 300  # Templates rarely change
+ADVISOR_INTERVENTIONS_CACHE_TTL = 30  # Re-read on every advisor dashboard rerun
+TREND_MONTHS = 6  # Default history for the monthly trends
+
+
+def _freeze(value):
+    """Read-only view of a query result: dicts -> MappingProxyType, lists -> tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _cached_analytics(method=None, *, ttl=ANALYTICS_CACHE_TTL):
+    """
+    Cache a method's result per arguments for ttl seconds
+    
+    The result is stored frozen (see _freeze) and every caller gets that
+    same object; use dict(row) / list(rows) for a mutable copy.
+    """
+    if method is None:
+        return functools.partial(_cached_analytics, ttl=ttl)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        cache = self._analytics_cache
+        
+        # The manager is shared by every Streamlit session; the query itself
+        # runs outside the lock
+        with self._analytics_lock:
+            entry = cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            generation = self._analytics_generation
+        
+        value = _freeze(method(self, *args, **kwargs))
+        
+        with self._analytics_lock:
+            # Don't store a result read before an intervention write
+            if generation != self._analytics_generation:
+                return value
+            now = time.monotonic()
+            cache.pop(key, None)
+            if len(cache) >= ANALYTICS_CACHE_SIZE:
+                for stale in [k for k, (expires_at, _) in cache.items() if expires_at <= now]:
+                    del cache[stale]
+                if len(cache) >= ANALYTICS_CACHE_SIZE:
+                    del cache[next(iter(cache))]  # Oldest entry
+            cache[key] = (now + ttl, value)
+        return value
+    
+    return wrapper
+
+def _add_rates(stats):
+    """Add success_rate and completion_rate (percentages) to a statistics dict"""
+    if stats['completed'] > 0:
+        stats['success_rate'] = (stats['avg_success_rating'] / 5 * 100) if stats['avg_success_rating'] else 0
+    else:
+        stats['success_rate'] = 0
+    
+    if stats['total_interventions'] > 0:
+        stats['completion_rate'] = (stats['completed'] / stats['total_interventions'] * 100)
+    else:
+        stats['completion_rate'] = 0
+    
+    return stats
+
+
+def _months_ago(months):
+    """SQLite date() modifier for N whole months back, e.g. '-6 months'"""
+    return f"-{int(months)} months"
+
+
+def _none_if_nan(value):
+    """Map a pandas NaN aggregate to None, as SQLite's AVG would return"""
+    return None if pd.isna(value) else float(value)
+
+
+def _records(df):
+    """DataFrame -> list of plain dicts with None for missing values"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
 class InterventionManager:
     """Manages all intervention operations"""
     
     def __init__(self):
         self.db = db
+        self._analytics_cache = {}
+        self._analytics_lock = threading.Lock()
+        self._analytics_generation = 0
+    
+    def _invalidate_analytics(self):
+        """Drop cached analytics after an intervention write"""
+        with self._analytics_lock:
+            self._analytics_cache.clear()
+            self._analytics_generation += 1
     
     # =====================================================
     # CREATE INTERVENTIONS
@@ -64,21 +277,21 @@ class InterventionManager:
         )
         
         # Create notification for student
-        student = self.db.get_student_by_id(student_id)
-        if student and student.get('user_id'):
-            self.db.create_notification(
-                user_id=student['user_id'],
-                notification_type='intervention_scheduled',
-                title=f'New Intervention Scheduled: {title}',
-                message=f'An intervention has been scheduled with your advisor. Date: {scheduled_date or "TBD"}',
-                priority=priority,
-                related_entity_type='interventions',
-                related_entity_id=intervention_id
-            )
+        _run_in_background(
+            self._notify_student,
+            student_id,
+            notification_type='intervention_scheduled',
+            title=f'New Intervention Scheduled: {title}',
+            message=f'An intervention has been scheduled with your advisor. Date: {scheduled_date or "TBD"}',
+            priority=priority,
+            related_entity_type='interventions',
+            related_entity_id=intervention_id
+        )
         
         # Log action
         self.db.log_action(advisor_id, 'INTERVENTION_CREATED', 'interventions', intervention_id)
         
+        self._invalidate_analytics()
         return intervention_id
     
     def create_from_template(self, student_id, advisor_id, template_id, scheduled_date=None):
@@ -135,20 +348,14 @@ class InterventionManager:
         update_data = {'status': new_status}
         
         if notes:
-            # Append to existing notes
-            intervention = self.db.execute_query(
-                "SELECT notes FROM interventions WHERE intervention_id = ?",
-                [intervention_id]
-            )
-            if intervention:
-                existing_notes = intervention[0].get('notes', '')
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                update_data['notes'] = f"{existing_notes}\n\n[{timestamp}] Status changed to {new_status}\n{notes}"
+            # Appended in the UPDATE itself, so concurrent updates can't drop each other's notes
+            update_data['append_notes'] = f"Status changed to {new_status}\n{notes}"
         
         if new_status == 'Completed':
-            update_data['completed_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            update_data['stamp'] = ('completed_date',)
         
         self.db.update_intervention(intervention_id, **update_data)
+        self._invalidate_analytics()
         
         # Log action
         self.db.log_action(None, 'INTERVENTION_STATUS_UPDATED', 'interventions', intervention_id,
@@ -175,31 +382,38 @@ class InterventionManager:
         self.db.update_intervention(
             intervention_id,
             status='Completed',
-            completed_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            stamp=('completed_date',),
             outcome_assessment=outcome_assessment,
             success_rating=success_rating,
             student_response=student_response,
             duration_minutes=duration_minutes
         )
-        
-        # Get intervention details
-        intervention = self.get_intervention_by_id(intervention_id)
+        self._invalidate_analytics()
         
         # Create notification for student
-        if intervention:
-            student = self.db.get_student_by_id(intervention['student_id'])
-            if student and student.get('user_id'):
-                self.db.create_notification(
-                    user_id=student['user_id'],
-                    notification_type='intervention_completed',
-                    title='Intervention Completed',
-                    message=f'Your intervention "{intervention["title"]}" has been completed. Please check the outcome notes.',
-                    related_entity_type='interventions',
-                    related_entity_id=intervention_id
-                )
+        _run_in_background(self._notify_completed, intervention_id)
         
         return True
     
+    def _notify_completed(self, intervention_id):
+        """Notify the student that their intervention was completed"""
+        intervention = self.get_intervention_by_id(intervention_id)
+        if intervention:
+            self._notify_student(
+                intervention['student_id'],
+                notification_type='intervention_completed',
+                title='Intervention Completed',
+                message=f'Your intervention "{intervention["title"]}" has been completed. Please check the outcome notes.',
+                related_entity_type='interventions',
+                related_entity_id=intervention_id
+            )
+    
+    def _notify_student(self, student_id, **notification):
+        """Send a notification to a student's login account, if they have one"""
+        user_id = self.db.get_student_user_id(student_id)
+        if user_id:
+            self.db.create_notification(user_id=user_id, **notification)
+    
     def schedule_follow_up(self, intervention_id, follow_up_date, notes=None):
         """
         Schedule follow-up for intervention
@@ -215,6 +429,7 @@ class InterventionManager:
             follow_up_date=follow_up_date,
             notes=notes
         )
+        self._invalidate_analytics()
         
         return True
     
@@ -224,103 +439,56 @@ class InterventionManager:
     
     def get_intervention_by_id(self, intervention_id):
         """Get intervention by ID"""
-        query = """
-            SELECT 
-                i.*,
-                s.first_name || ' ' || s.last_name as student_name,
-                s.email as student_email,
-                s.classification as student_classification,
-                a.first_name || ' ' || a.last_name as advisor_name,
-                a.email as advisor_email,
-                it.type_name as intervention_type_name,
-                it.category as intervention_category
-            FROM interventions i
-            JOIN students s ON i.student_id = s.student_id
-            JOIN advisors a ON i.advisor_id = a.advisor_id
-            LEFT JOIN intervention_types it ON i.intervention_type_id = it.intervention_type_id
-            WHERE i.intervention_id = ?
-        """
-        
-        result = self.db.execute_query(query, [intervention_id])
+        result = self.db.execute_query(_Q_BY_ID, [intervention_id])
         return result[0] if result else None
     
-    def get_interventions_for_student(self, student_id, status=None):
-        """Get all interventions for a student"""
-        interventions = self.db.get_interventions(student_id=student_id, status=status)
+    def get_interventions_for_student(self, student_id, status=None, columns=None):
+        """Get all interventions for a student (columns: SQL select list, default list-view columns)"""
+        interventions = self.db.get_interventions(student_id=student_id, status=status,
+                                                  columns=columns or _LIST_COLUMNS)
         return interventions
     
-    def get_interventions_for_advisor(self, advisor_id, status=None):
-        """Get all interventions for an advisor"""
-        interventions = self.db.get_interventions(advisor_id=advisor_id, status=status)
-        return interventions
+    def get_interventions_for_advisor(self, advisor_id, status=None, columns=None):
+        """Get all interventions for an advisor (columns: SQL select list, default list-view columns)"""
+        # Same list of dicts as get_interventions_for_student; rows hold only
+        # scalars, so copying them out of the frozen cache entry is cheap
+        return [dict(row) for row in self._advisor_interventions(advisor_id, status, columns)]
+    
+    @_cached_analytics(ttl=ADVISOR_INTERVENTIONS_CACHE_TTL)
+    def _advisor_interventions(self, advisor_id, status, columns):
+        """Cached query behind get_interventions_for_advisor"""
+        return self.db.get_interventions(advisor_id=advisor_id, status=status,
+                                         columns=columns or _LIST_COLUMNS)
+    
+    # The list endpoints below return sqlite3.Row objects (row['column'],
+    # row.keys(); dict(row) for a mutable copy)
     
     def get_pending_interventions(self, advisor_id=None):
         """Get all pending interventions"""
-        query = """
-            SELECT 
-                i.*,
-                s.first_name || ' ' || s.last_name as student_name,
-                s.classification as student_classification,
-                rs.overall_risk_score,
-                rs.risk_category
-            FROM interventions i
-            JOIN students s ON i.student_id = s.student_id
-            LEFT JOIN risk_scores rs ON s.student_id = rs.student_id AND rs.is_current = 1
-            WHERE i.status IN ('Scheduled', 'In Progress')
-        """
-        
-        params = []
         if advisor_id:
-            query += " AND i.advisor_id = ?"
-            params.append(advisor_id)
-        
-        query += " ORDER BY i.priority DESC, i.scheduled_date ASC"
-        
-        return self.db.execute_query(query, params if params else None)
+            return self.db.fetch_rows(_Q_PENDING_FOR_ADVISOR, [advisor_id])
+        return self.db.fetch_rows(_Q_PENDING)
     
-    def get_overdue_interventions(self, advisor_id=None):
-        """Get interventions that are overdue"""
-        query = """
-            SELECT 
-                i.*,
-                s.first_name || ' ' || s.last_name as student_name
-            FROM interventions i
-            JOIN students s ON i.student_id = s.student_id
-            WHERE i.status = 'Scheduled'
-            AND i.scheduled_date < date('now')
-        """
-        
-        params = []
+    def get_overdue_interventions(self, advisor_id=None, limit=200):
+        """Get interventions that are overdue, oldest first (at most limit rows)"""
         if advisor_id:
-            query += " AND i.advisor_id = ?"
-            params.append(advisor_id)
-        
-        return self.db.execute_query(query, params if params else None)
+            return self.db.fetch_rows(_Q_OVERDUE_FOR_ADVISOR, [advisor_id, limit])
+        return self.db.fetch_rows(_Q_OVERDUE, [limit])
     
     def get_follow_ups_due(self, advisor_id=None):
         """Get interventions with follow-ups due"""
-        query = """
-            SELECT 
-                i.*,
-                s.first_name || ' ' || s.last_name as student_name
-            FROM interventions i
-            JOIN students s ON i.student_id = s.student_id
-            WHERE i.follow_up_required = 1
-            AND i.follow_up_date <= date('now', '+7 days')
-            AND i.status = 'Completed'
-        """
-        
-        params = []
         if advisor_id:
-            query += " AND i.advisor_id = ?"
-            params.append(advisor_id)
-        
-        return self.db.execute_query(query, params if params else None)
+            return self.db.fetch_rows(_Q_FOLLOW_UPS_FOR_ADVISOR, [advisor_id])
+        return self.db.fetch_rows(_Q_FOLLOW_UPS)
     
     # =====================================================
     # ANALYTICS
     # =====================================================
     
+    # The statistics, type/priority breakdowns and monthly trends are all
+    # slices of one cached get_intervention_analytics scan, so a dashboard
+    # showing several of them reads the interventions table once.
+    
     def get_intervention_statistics(self, advisor_id=None, start_date=None, end_date=None):
         """
         Get intervention statistics
@@ -333,6 +501,13 @@ class InterventionManager:
         Returns:
             dict: Statistics
         """
+        if not start_date and not end_date:
+            return self.get_intervention_analytics(advisor_id, TREND_MONTHS)['statistics']
+        return self._intervention_statistics_between(advisor_id, start_date, end_date)
+    
+    @_cached_analytics
+    def _intervention_statistics_between(self, advisor_id, start_date, end_date):
+        """Statistics for a created_at window, aggregated in SQL"""
         query = """
             SELECT 
                 COUNT(*) as total_interventions,
@@ -364,86 +539,100 @@ class InterventionManager:
         result = self.db.execute_query(query, params if params else None)
         
         if result:
-            stats = dict(result[0])
-            
-            # Calculate success rate
-            if stats['completed'] > 0:
-                stats['success_rate'] = (stats['avg_success_rating'] / 5 * 100) if stats['avg_success_rating'] else 0
-            else:
-                stats['success_rate'] = 0
-            
-            # Calculate completion rate
-            if stats['total_interventions'] > 0:
-                stats['completion_rate'] = (stats['completed'] / stats['total_interventions'] * 100)
-            else:
-                stats['completion_rate'] = 0
-            
-            return stats
+            return _add_rates(dict(result[0]))
         
         return {}
     
     def get_interventions_by_type(self, advisor_id=None):
         """Get intervention counts by type"""
-        query = """
-            SELECT 
-                it.type_name,
-                it.category,
-                COUNT(*) as count,
-                AVG(CASE WHEN i.success_rating IS NOT NULL THEN i.success_rating END) as avg_rating
-            FROM interventions i
-            LEFT JOIN intervention_types it ON i.intervention_type_id = it.intervention_type_id
-            WHERE 1=1
-        """
-        
-        params = []
-        if advisor_id:
-            query += " AND i.advisor_id = ?"
-            params.append(advisor_id)
-        
-        query += " GROUP BY it.type_name, it.category ORDER BY count DESC"
-        
-        return self.db.execute_query(query, params if params else None)
+        return self.get_intervention_analytics(advisor_id, TREND_MONTHS)['by_type']
     
     def get_interventions_by_priority(self, advisor_id=None):
         """Get intervention counts by priority"""
-        query = """
-            SELECT 
-                priority,
-                COUNT(*) as count,
-                SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) as completed
-            FROM interventions
-            WHERE 1=1
+        return self.get_intervention_analytics(advisor_id, TREND_MONTHS)['by_priority']
+    
+    def get_monthly_intervention_trends(self, advisor_id=None, months=TREND_MONTHS):
+        """Get intervention trends over time"""
+        return self.get_intervention_analytics(advisor_id, months)['monthly_trends']
+    
+    @_cached_analytics
+    def get_intervention_analytics(self, advisor_id=None, months=TREND_MONTHS):
         """
+        Get statistics, type/priority breakdowns and monthly trends in one scan
         
-        params = []
-        if advisor_id:
-            query += " AND advisor_id = ?"
-            params.append(advisor_id)
+        Backs get_intervention_statistics, get_interventions_by_type,
+        get_interventions_by_priority and get_monthly_intervention_trends,
+        aggregated in pandas from a single projection of the interventions
+        table.
         
-        query += " GROUP BY priority ORDER BY count DESC"
+        Args:
+            advisor_id: Filter by advisor
+            months: Months of history for the trends
         
-        return self.db.execute_query(query, params if params else None)
-    
-    def get_monthly_intervention_trends(self, advisor_id=None, months=6):
-        """Get intervention trends over time"""
+        Returns:
+            dict: statistics, by_type, by_priority, monthly_trends
+        """
         query = """
             SELECT 
-                strftime('%Y-%m', created_at) as month,
-                COUNT(*) as count,
-                SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) as completed
-            FROM interventions
-            WHERE created_at >= date('now', '-' || ? || ' months')
+                i.student_id,
+                i.status,
+                i.priority,
+                i.success_rating,
+                i.duration_minutes,
+                i.type_name,
+                i.type_category as category,
+                strftime('%Y-%m', i.created_at) as month,
+                i.created_at >= date('now', ?) as in_window
+            FROM interventions i
         """
         
-        params = [months]
-        
+        params = [_months_ago(months)]
         if advisor_id:
-            query += " AND advisor_id = ?"
+            query += " WHERE i.advisor_id = ?"
             params.append(advisor_id)
         
-        query += " GROUP BY month ORDER BY month"
+        df = pd.DataFrame(self.db.execute_query(query, params), columns=[
+            'student_id', 'status', 'priority', 'success_rating', 'duration_minutes',
+            'type_name', 'category', 'month', 'in_window'
+        ])
+        df['completed'] = (df['status'] == 'Completed').astype(int)
+        
+        statistics = _add_rates({
+            'total_interventions': len(df),
+            'completed': int(df['completed'].sum()),
+            'scheduled': int((df['status'] == 'Scheduled').sum()),
+            'in_progress': int((df['status'] == 'In Progress').sum()),
+            'cancelled': int((df['status'] == 'Cancelled').sum()),
+            'avg_success_rating': _none_if_nan(df['success_rating'].mean()),
+            'avg_duration': _none_if_nan(df['duration_minutes'].mean()),
+            'unique_students': int(df['student_id'].nunique()),
+        })
+        
+        by_type = (
+            df.groupby(['type_name', 'category'], dropna=False)
+            .agg(count=('status', 'size'), avg_rating=('success_rating', 'mean'))
+            .reset_index()
+            .sort_values('count', ascending=False, kind='stable')
+        )
+        by_priority = (
+            df.groupby('priority', dropna=False)
+            .agg(count=('status', 'size'), completed=('completed', 'sum'))
+            .reset_index()
+            .sort_values('count', ascending=False, kind='stable')
+        )
+        monthly_trends = (
+            df[df['in_window'] == 1]
+            .groupby('month')
+            .agg(count=('status', 'size'), completed=('completed', 'sum'))
+            .reset_index()
+        )
         
-        return self.db.execute_query(query, params)
+        return {
+            'statistics': statistics,
+            'by_type': _records(by_type),
+            'by_priority': _records(by_priority),
+            'monthly_trends': _records(monthly_trends),
+        }
     
     # =====================================================
     # TEMPLATES
@@ -455,25 +644,24 @@ class InterventionManager:
             SELECT * FROM intervention_types WHERE is_active = 1 ORDER BY category, type_name
         """)
     
+    @_cached_analytics(ttl=INTERVENTION_TYPES_CACHE_TTL)
     def get_intervention_types_by_category(self):
         """Get intervention types grouped by category"""
-        types = self.get_intervention_types()
-        
-        grouped = {}
-        for itype in types:
-            category = itype['category']
-            if category not in grouped:
-                grouped[category] = []
-            grouped[category].append(itype)
-        
-        return grouped
+        # Already ordered by category, so one groupby pass suffices
+        return {
+            category: list(types)
+            for category, types in itertools.groupby(
+                self.get_intervention_types(), key=operator.itemgetter('category')
+            )
+        }
     
     # =====================================================
     # BULK OPERATIONS
     # =====================================================
     
     def create_bulk_interventions(self, student_ids, advisor_id, intervention_type_id, 
-                                 priority='Medium', scheduled_date=None):
+                                 priority='Medium', scheduled_date=None,
+                                 send_notifications=True, log_each=True):
         """
         Create interventions for multiple students
         
@@ -483,6 +671,8 @@ class InterventionManager:
             intervention_type_id: Type of intervention
             priority: Priority level
             scheduled_date: When to schedule
+            send_notifications: False skips student notifications (caller sends them later)
+            log_each: False writes one BULK_INTERVENTION_CREATED audit row instead of one per intervention
         
         Returns:
             list: Created intervention IDs
@@ -498,19 +688,44 @@ class InterventionManager:
         
         template = template[0]
         
-        intervention_ids = []
-        
-        for student_id in student_ids:
-            intervention_id = self.create_intervention(
-                student_id=student_id,
-                advisor_id=advisor_id,
-                title=template['type_name'],
-                description=template['description'],
-                intervention_type_id=intervention_type_id,
-                priority=priority,
-                scheduled_date=scheduled_date
+        rows = [
+            (
+                student_id,
+                advisor_id,
+                intervention_type_id,
+                template['type_name'],
+                template['description'],
+                priority,
+                'Scheduled',
+                scheduled_date,
+                None,
+                'In-person',
+                0,
+                None
             )
-            intervention_ids.append(intervention_id)
+            for student_id in student_ids
+        ]
+        intervention_ids = self.db.bulk_create_interventions(rows)
+        self._invalidate_analytics()
+        
+        # Notify every student with a login in a single server-side join
+        if send_notifications:
+            self.db.create_intervention_notifications(
+                intervention_ids,
+                'intervention_scheduled',
+                f'New Intervention Scheduled: {template["type_name"]}',
+                f'An intervention has been scheduled with your advisor. Date: {scheduled_date or "TBD"}',
+                priority
+            )
+        
+        # Log actions
+        if log_each:
+            for intervention_id in intervention_ids:
+                self.db.log_action(advisor_id, 'INTERVENTION_CREATED', 'interventions', intervention_id)
+        elif intervention_ids:
+            self.db.log_action(advisor_id, 'BULK_INTERVENTION_CREATED', 'interventions',
+                               new_values={'count': len(intervention_ids),
+                                           'intervention_ids': intervention_ids})
         
         return intervention_ids
 
@@ -7,13 +7,21 @@ Author: Rovo Dev AI Assistant
 Date: November 18, 2025
 """
 
+import functools
+import html
+import re
+from pathlib import Path
+from string import Template
+from types import MappingProxyType
+
 import streamlit as st
 
 # =====================================================
 # COLOR PALETTE - Premium HSU Brand Colors
 # =====================================================
 
-COLORS = {
+# Read-only: the CSS below is built from these once at import
+COLORS = MappingProxyType({
     # Primary Brand Colors
     'primary': '#003366',        # Deep Navy Blue (Primary)
     'primary_light': '#0055AA',  # Lighter Blue
@@ -48,96 +56,117 @@ COLORS = {
     'high': '#F59E0B',
     'medium': '#FBBF24',
     'low': '#10B981',
-}
+})
 
 # =====================================================
 # PREMIUM CSS STYLES
 # =====================================================
 
-def get_premium_css():
-    """Get comprehensive premium CSS styling"""
-    return f"""
-    <style>
+# Generated stylesheet; rebuild with `python scripts/build_css.py` after
+# changing COLORS or the template below
+PREMIUM_CSS_FILE = Path(__file__).with_name("premium.min.css")
+
+# The fonts are linked next to the <style> block rather than @import-ed
+# inside it, so their stylesheet is fetched in parallel instead of only
+# after the CSS is parsed. They stay on Google Fonts: the repo ships no
+# font files and static serving is not enabled.
+_FONT_LINKS = (
+    '<link rel="preconnect" href="https://fonts.googleapis.com">'
+    '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>'
+    '<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&family=Playfair+Display:wght@700;900&display=swap">'
+)
+
+# Stylesheet template: $name fields are COLORS keys (used only in :root)
+_CSS_TEMPLATE = Template("""
     /* ==================== GLOBAL STYLES ==================== */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&family=Playfair+Display:wght@700;900&display=swap');
+    /* Palette (the only values taken from COLORS) and shared fragments */
+    :root {
+        --primary: $primary;
+        --primary-light: $primary_light;
+        --primary-dark: $primary_dark;
+        --accent: $accent;
+        --accent-light: $accent_light;
+        --accent-dark: $accent_dark;
+        --success: $success;
+        --warning: $warning;
+        --danger: $danger;
+        --info: $info;
+        --white: $white;
+        --gray-50: $gray_50;
+        --gray-100: $gray_100;
+        --gray-200: $gray_200;
+        --gray-300: $gray_300;
+        --gray-400: $gray_400;
+        --gray-500: $gray_500;
+        --gray-600: $gray_600;
+        --gray-700: $gray_700;
+        --gray-800: $gray_800;
+        --gray-900: $gray_900;
+        --critical: $critical;
+        --high: $high;
+        --medium: $medium;
+        --low: $low;
+        
+        /* Gradients and shadows used by several rules */
+        --grad-primary: linear-gradient(135deg, var(--primary) 0%, var(--primary-light) 100%);
+        --grad-accent: linear-gradient(135deg, var(--accent) 0%, var(--accent-dark) 100%);
+        --grad-success: linear-gradient(135deg, var(--success) 0%, #059669 100%);
+        --grad-danger: linear-gradient(135deg, var(--danger) 0%, #991B1B 100%);
+        --grad-surface: linear-gradient(135deg, var(--gray-50) 0%, var(--white) 100%);
+        --grad-brand: linear-gradient(90deg, var(--primary) 0%, var(--accent) 100%);
+        --shadow-primary: 0 4px 15px rgba(0, 51, 102, 0.3);
+        --shadow-soft: 0 4px 20px rgba(0, 0, 0, 0.06);
+    }
     
-    * {{
+    body, input, button, select, textarea, [data-testid="stMarkdownContainer"] {
         font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-    }}
+    }
     
     /* Main Container */
-    .main {{
-        background: linear-gradient(135deg, {COLORS['gray_50']} 0%, {COLORS['white']} 100%);
+    .main {
+        background: var(--grad-surface);
         padding: 2rem;
-    }}
+    }
     
     /* Sidebar Styling */
-    [data-testid="stSidebar"] {{
-        background: linear-gradient(180deg, {COLORS['primary']} 0%, {COLORS['primary_dark']} 100%);
+    [data-testid="stSidebar"] {
+        background: linear-gradient(180deg, var(--primary) 0%, var(--primary-dark) 100%);
         padding: 2rem 1rem;
         box-shadow: 4px 0 20px rgba(0, 0, 0, 0.1);
-    }}
+    }
     
-    [data-testid="stSidebar"] * {{
-        color: {COLORS['white']} !important;
-    }}
+    [data-testid="stSidebar"] * {
+        color: var(--white) !important;
+    }
     
-    [data-testid="stSidebar"] .stButton button {{
-        background: linear-gradient(135deg, {COLORS['accent']} 0%, {COLORS['accent_dark']} 100%);
-        color: {COLORS['primary']} !important;
+    [data-testid="stSidebar"] .stButton button {
+        background: var(--grad-accent);
+        color: var(--primary) !important;
         border: none;
         border-radius: 12px;
         padding: 0.75rem 1.5rem;
         font-weight: 600;
         transition: all 0.3s ease;
         box-shadow: 0 4px 15px rgba(255, 184, 28, 0.3);
-    }}
+    }
     
-    [data-testid="stSidebar"] .stButton button:hover {{
-        transform: translateY(-2px);
+    [data-testid="stSidebar"] .stButton button:hover {
         box-shadow: 0 6px 20px rgba(255, 184, 28, 0.4);
-    }}
-    
-    /* ==================== PREMIUM CARDS ==================== */
-    .premium-card {{
-        background: {COLORS['white']};
-        border-radius: 16px;
-        padding: 2rem;
-        box-shadow: 0 10px 40px rgba(0, 0, 0, 0.08);
-        border: 1px solid {COLORS['gray_200']};
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        position: relative;
-        overflow: hidden;
-    }}
-    
-    .premium-card::before {{
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 4px;
-        background: linear-gradient(90deg, {COLORS['primary']} 0%, {COLORS['accent']} 100%);
-    }}
-    
-    .premium-card:hover {{
-        transform: translateY(-5px);
-        box-shadow: 0 20px 60px rgba(0, 0, 0, 0.12);
-    }}
+    }
     
     /* ==================== HEADERS ==================== */
-    .premium-header {{
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['primary_light']} 100%);
+    .premium-header {
+        background: var(--grad-primary);
         padding: 3rem 2rem;
         border-radius: 20px;
-        color: {COLORS['white']};
+        color: var(--white);
         margin-bottom: 2rem;
         box-shadow: 0 10px 40px rgba(0, 51, 102, 0.3);
         position: relative;
         overflow: hidden;
-    }}
+    }
     
-    .premium-header::after {{
+    .premium-header::after {
         content: '';
         position: absolute;
         top: -50%;
@@ -146,153 +175,151 @@ def get_premium_css():
         height: 300px;
         background: radial-gradient(circle, rgba(255, 255, 255, 0.1) 0%, transparent 70%);
         border-radius: 50%;
-    }}
+    }
     
-    .premium-header h1 {{
+    .premium-header h1 {
         font-family: 'Playfair Display', serif;
         font-size: 3rem;
         font-weight: 900;
         margin: 0;
         letter-spacing: -0.02em;
         text-shadow: 0 2px 10px rgba(0, 0, 0, 0.2);
-    }}
+    }
     
-    .premium-header p {{
+    .premium-header p {
         font-size: 1.2rem;
         opacity: 0.95;
         margin-top: 0.5rem;
         font-weight: 400;
-    }}
+    }
     
     /* ==================== BUTTONS ==================== */
-    .stButton button {{
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['primary_light']} 100%);
-        color: {COLORS['white']};
+    .stButton button {
+        background: var(--grad-primary);
+        color: var(--white);
         border: none;
         border-radius: 12px;
         padding: 0.75rem 2rem;
         font-weight: 600;
         font-size: 1rem;
         transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(0, 51, 102, 0.3);
+        box-shadow: var(--shadow-primary);
         cursor: pointer;
-    }}
+    }
     
-    .stButton button:hover {{
-        transform: translateY(-2px);
+    .stButton button:hover {
         box-shadow: 0 6px 25px rgba(0, 51, 102, 0.4);
-        background: linear-gradient(135deg, {COLORS['primary_light']} 0%, {COLORS['primary']} 100%);
-    }}
-    
-    .stButton button:active {{
-        transform: translateY(0px);
-    }}
-    
-    /* Premium Button Variants */
-    .premium-btn-primary {{
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['primary_light']} 100%);
-    }}
-    
-    .premium-btn-accent {{
-        background: linear-gradient(135deg, {COLORS['accent']} 0%, {COLORS['accent_dark']} 100%);
-        color: {COLORS['primary']} !important;
-    }}
-    
-    .premium-btn-success {{
-        background: linear-gradient(135deg, {COLORS['success']} 0%, #059669 100%);
-    }}
-    
-    .premium-btn-danger {{
-        background: linear-gradient(135deg, {COLORS['danger']} 0%, #991B1B 100%);
-    }}
+        background: linear-gradient(135deg, var(--primary-light) 0%, var(--primary) 100%);
+    }
     
     /* ==================== METRICS/STATS ==================== */
-    .premium-metric {{
-        background: {COLORS['white']};
+    .premium-metric {
+        background: var(--white);
         border-radius: 16px;
         padding: 1.5rem;
-        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.06);
-        border: 1px solid {COLORS['gray_200']};
+        box-shadow: var(--shadow-soft);
+        border: 1px solid var(--gray-200);
         text-align: center;
         transition: all 0.3s ease;
-    }}
+    }
     
-    .premium-metric:hover {{
-        transform: translateY(-3px);
+    .premium-metric:hover {
         box-shadow: 0 8px 30px rgba(0, 0, 0, 0.1);
-    }}
+    }
     
-    .premium-metric-value {{
+    .premium-metric-value {
         font-size: 2.5rem;
         font-weight: 800;
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['primary_light']} 100%);
+        background: var(--grad-primary);
         -webkit-background-clip: text;
         -webkit-text-fill-color: transparent;
         background-clip: text;
-    }}
+    }
     
-    .premium-metric-label {{
+    .premium-stat-grid {
+        display: grid;
+        gap: 1rem;
+    }
+    
+    /* Metric value colors (premium_metric's color); background-image keeps the text clip */
+    .premium-metric-value--success {
+        background-image: var(--grad-success);
+    }
+    
+    .premium-metric-value--warning {
+        background-image: linear-gradient(135deg, var(--warning) 0%, #D97706 100%);
+    }
+    
+    .premium-metric-value--danger {
+        background-image: var(--grad-danger);
+    }
+    
+    .premium-metric-value--info {
+        background-image: linear-gradient(135deg, var(--info) 0%, #2563EB 100%);
+    }
+    
+    .premium-metric-label {
         font-size: 0.9rem;
-        color: {COLORS['gray_600']};
+        color: var(--gray-600);
         font-weight: 500;
         margin-top: 0.5rem;
         text-transform: uppercase;
         letter-spacing: 0.05em;
-    }}
+    }
     
     /* ==================== TABLES ==================== */
-    .dataframe {{
+    .dataframe {
         border: none !important;
         border-radius: 12px !important;
         overflow: hidden !important;
-        box-shadow: 0 4px 20px rgba(0, 0, 0, 0.06) !important;
-    }}
+        box-shadow: var(--shadow-soft) !important;
+    }
     
-    .dataframe thead tr {{
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['primary_light']} 100%);
-        color: {COLORS['white']};
-    }}
+    .dataframe thead tr {
+        background: var(--grad-primary);
+        color: var(--white);
+    }
     
-    .dataframe thead th {{
+    .dataframe thead th {
         padding: 1rem !important;
         font-weight: 600 !important;
         text-transform: uppercase;
         font-size: 0.85rem;
         letter-spacing: 0.05em;
-    }}
+    }
     
-    .dataframe tbody tr {{
-        transition: all 0.2s ease;
-    }}
+    .dataframe tbody tr {
+        transition: background-color 0.2s ease;
+    }
     
-    .dataframe tbody tr:hover {{
-        background-color: {COLORS['gray_50']} !important;
-        transform: scale(1.01);
-    }}
+    .dataframe tbody tr:hover {
+        background-color: var(--gray-50) !important;
+        box-shadow: inset 3px 0 0 var(--primary);
+    }
     
-    .dataframe tbody td {{
+    .dataframe tbody td {
         padding: 1rem !important;
-        border-bottom: 1px solid {COLORS['gray_200']} !important;
-    }}
+        border-bottom: 1px solid var(--gray-200) !important;
+    }
     
     /* ==================== INPUTS ==================== */
-    .stTextInput input, .stSelectbox select, .stTextArea textarea {{
+    .stTextInput input, .stSelectbox select, .stTextArea textarea {
         border-radius: 12px !important;
-        border: 2px solid {COLORS['gray_300']} !important;
+        border: 2px solid var(--gray-300) !important;
         padding: 0.75rem 1rem !important;
         font-size: 1rem !important;
         transition: all 0.3s ease !important;
-        background: {COLORS['white']} !important;
-    }}
+        background: var(--white) !important;
+    }
     
-    .stTextInput input:focus, .stSelectbox select:focus, .stTextArea textarea:focus {{
-        border-color: {COLORS['primary']} !important;
+    .stTextInput input:focus, .stSelectbox select:focus, .stTextArea textarea:focus {
+        border-color: var(--primary) !important;
         box-shadow: 0 0 0 3px rgba(0, 51, 102, 0.1) !important;
         outline: none !important;
-    }}
+    }
     
     /* ==================== BADGES ==================== */
-    .badge {{
+    .badge {
         display: inline-block;
         padding: 0.5rem 1rem;
         border-radius: 20px;
@@ -300,297 +327,348 @@ def get_premium_css():
         font-size: 0.85rem;
         text-transform: uppercase;
         letter-spacing: 0.05em;
-    }}
+    }
     
-    .badge-critical {{
-        background: linear-gradient(135deg, {COLORS['critical']} 0%, #991B1B 100%);
-        color: {COLORS['white']};
-    }}
+    .badge-critical {
+        background: linear-gradient(135deg, var(--critical) 0%, #991B1B 100%);
+        color: var(--white);
+    }
     
-    .badge-high {{
-        background: linear-gradient(135deg, {COLORS['high']} 0%, #D97706 100%);
-        color: {COLORS['white']};
-    }}
+    .badge-high {
+        background: linear-gradient(135deg, var(--high) 0%, #D97706 100%);
+        color: var(--white);
+    }
     
-    .badge-medium {{
-        background: linear-gradient(135deg, {COLORS['medium']} 0%, #F59E0B 100%);
-        color: {COLORS['gray_900']};
-    }}
+    .badge-medium {
+        background: linear-gradient(135deg, var(--medium) 0%, #F59E0B 100%);
+        color: var(--gray-900);
+    }
     
-    .badge-low {{
-        background: linear-gradient(135deg, {COLORS['low']} 0%, #059669 100%);
-        color: {COLORS['white']};
-    }}
+    .badge-low {
+        background: linear-gradient(135deg, var(--low) 0%, #059669 100%);
+        color: var(--white);
+    }
     
     /* ==================== ALERTS ==================== */
-    .premium-alert {{
+    .premium-alert {
         border-radius: 12px;
         padding: 1.5rem;
         margin: 1rem 0;
         border-left: 4px solid;
         box-shadow: 0 4px 15px rgba(0, 0, 0, 0.08);
-    }}
+    }
     
-    .premium-alert-success {{
+    .premium-alert-success {
         background: linear-gradient(135deg, rgba(16, 185, 129, 0.1) 0%, rgba(16, 185, 129, 0.05) 100%);
-        border-left-color: {COLORS['success']};
-    }}
+        border-left-color: var(--success);
+    }
     
-    .premium-alert-warning {{
+    .premium-alert-warning {
         background: linear-gradient(135deg, rgba(245, 158, 11, 0.1) 0%, rgba(245, 158, 11, 0.05) 100%);
-        border-left-color: {COLORS['warning']};
-    }}
+        border-left-color: var(--warning);
+    }
     
-    .premium-alert-danger {{
+    .premium-alert-danger {
         background: linear-gradient(135deg, rgba(220, 38, 38, 0.1) 0%, rgba(220, 38, 38, 0.05) 100%);
-        border-left-color: {COLORS['danger']};
-    }}
+        border-left-color: var(--danger);
+    }
     
-    .premium-alert-info {{
+    .premium-alert-info {
         background: linear-gradient(135deg, rgba(59, 130, 246, 0.1) 0%, rgba(59, 130, 246, 0.05) 100%);
-        border-left-color: {COLORS['info']};
-    }}
+        border-left-color: var(--info);
+    }
     
     /* ==================== ANIMATIONS ==================== */
-    @keyframes fadeInUp {{
-        from {{
+    @keyframes fadeInUp {
+        from {
             opacity: 0;
             transform: translateY(30px);
-        }}
-        to {{
+        }
+        to {
             opacity: 1;
             transform: translateY(0);
-        }}
-    }}
-    
-    @keyframes fadeIn {{
-        from {{ opacity: 0; }}
-        to {{ opacity: 1; }}
-    }}
-    
-    @keyframes slideInRight {{
-        from {{
-            opacity: 0;
-            transform: translateX(30px);
-        }}
-        to {{
-            opacity: 1;
-            transform: translateX(0);
-        }}
-    }}
+        }
+    }
     
-    @keyframes pulse {{
-        0%, 100% {{ transform: scale(1); }}
-        50% {{ transform: scale(1.05); }}
-    }}
+    @keyframes fadeIn {
+        from { opacity: 0; }
+        to { opacity: 1; }
+    }
     
-    .animate-fadeInUp {{
+    .animate-fadeInUp {
         animation: fadeInUp 0.6s ease-out;
-    }}
+    }
     
-    .animate-fadeIn {{
+    .animate-fadeIn {
         animation: fadeIn 0.4s ease-out;
-    }}
+    }
     
-    .animate-slideInRight {{
-        animation: slideInRight 0.5s ease-out;
-    }}
+    /* Hover lift only for pointer devices and users who allow motion */
+    @media (hover: hover) and (prefers-reduced-motion: no-preference) {
+        .premium-metric:hover {
+            transform: translateY(-3px);
+        }
+        
+        .stButton button:hover,
+        [data-testid="stSidebar"] .stButton button:hover {
+            transform: translateY(-2px);
+        }
+        
+        .stButton button:active {
+            transform: translateY(0px);
+        }
+    }
     
     /* ==================== EXPANDERS ==================== */
-    .streamlit-expanderHeader {{
-        background: linear-gradient(135deg, {COLORS['gray_50']} 0%, {COLORS['white']} 100%);
+    .streamlit-expanderHeader {
+        background: var(--grad-surface);
         border-radius: 12px;
         padding: 1rem 1.5rem !important;
         font-weight: 600;
-        border: 1px solid {COLORS['gray_200']};
+        border: 1px solid var(--gray-200);
         transition: all 0.3s ease;
-    }}
+    }
     
-    .streamlit-expanderHeader:hover {{
-        background: linear-gradient(135deg, {COLORS['gray_100']} 0%, {COLORS['gray_50']} 100%);
-        border-color: {COLORS['primary']};
-    }}
+    .streamlit-expanderHeader:hover {
+        background: linear-gradient(135deg, var(--gray-100) 0%, var(--gray-50) 100%);
+        border-color: var(--primary);
+    }
     
     /* ==================== TABS ==================== */
-    .stTabs [data-baseweb="tab-list"] {{
+    .stTabs [data-baseweb="tab-list"] {
         gap: 0.5rem;
-        background: {COLORS['white']};
+        background: var(--white);
         padding: 0.5rem;
         border-radius: 12px;
         box-shadow: 0 2px 10px rgba(0, 0, 0, 0.05);
-    }}
+    }
     
-    .stTabs [data-baseweb="tab"] {{
+    .stTabs [data-baseweb="tab"] {
         border-radius: 8px;
         padding: 0.75rem 1.5rem;
         font-weight: 600;
         transition: all 0.3s ease;
-    }}
+    }
     
-    .stTabs [aria-selected="true"] {{
-        background: linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['primary_light']} 100%);
-        color: {COLORS['white']};
-        box-shadow: 0 4px 15px rgba(0, 51, 102, 0.3);
-    }}
+    .stTabs [aria-selected="true"] {
+        background: var(--grad-primary);
+        color: var(--white);
+        box-shadow: var(--shadow-primary);
+    }
     
     /* ==================== PROGRESS BARS ==================== */
-    .stProgress > div > div > div {{
-        background: linear-gradient(90deg, {COLORS['primary']} 0%, {COLORS['accent']} 100%);
+    .stProgress > div > div > div {
+        background: var(--grad-brand);
         border-radius: 10px;
-    }}
+    }
     
     /* ==================== TOOLTIPS ==================== */
-    [data-testid="stTooltipIcon"] {{
-        color: {COLORS['gray_500']};
+    [data-testid="stTooltipIcon"] {
+        color: var(--gray-500);
         transition: color 0.3s ease;
-    }}
+    }
     
-    [data-testid="stTooltipIcon"]:hover {{
-        color: {COLORS['primary']};
-    }}
+    [data-testid="stTooltipIcon"]:hover {
+        color: var(--primary);
+    }
     
     /* ==================== DIVIDERS ==================== */
-    hr {{
+    hr {
         margin: 2rem 0;
         border: none;
         height: 2px;
-        background: linear-gradient(90deg, transparent 0%, {COLORS['gray_300']} 50%, transparent 100%);
-    }}
+        background: linear-gradient(90deg, transparent 0%, var(--gray-300) 50%, transparent 100%);
+    }
     
     /* ==================== SCROLLBAR ==================== */
-    ::-webkit-scrollbar {{
+    ::-webkit-scrollbar {
         width: 10px;
         height: 10px;
-    }}
+    }
     
-    ::-webkit-scrollbar-track {{
-        background: {COLORS['gray_100']};
+    ::-webkit-scrollbar-track {
+        background: var(--gray-100);
         border-radius: 10px;
-    }}
+    }
     
-    ::-webkit-scrollbar-thumb {{
-        background: linear-gradient(180deg, {COLORS['primary']} 0%, {COLORS['primary_light']} 100%);
+    ::-webkit-scrollbar-thumb {
+        background: linear-gradient(180deg, var(--primary) 0%, var(--primary-light) 100%);
         border-radius: 10px;
-    }}
+    }
     
-    ::-webkit-scrollbar-thumb:hover {{
-        background: linear-gradient(180deg, {COLORS['primary_light']} 0%, {COLORS['primary']} 100%);
-    }}
+    ::-webkit-scrollbar-thumb:hover {
+        background: linear-gradient(180deg, var(--primary-light) 0%, var(--primary) 100%);
+    }
     
     /* ==================== RESPONSIVE ==================== */
-    @media (max-width: 768px) {{
-        .premium-header h1 {{
+    @media (max-width: 768px) {
+        .premium-header h1 {
             font-size: 2rem;
-        }}
-        
-        .premium-card {{
-            padding: 1.5rem;
-        }}
+        }
         
-        .premium-metric-value {{
+        .premium-metric-value {
             font-size: 2rem;
-        }}
-    }}
+        }
+        
+        .premium-stat-grid {
+            grid-template-columns: 1fr !important;
+        }
+    }
     
     /* ==================== LOADING SPINNER ==================== */
-    .stSpinner > div {{
-        border-top-color: {COLORS['primary']} !important;
-    }}
+    .stSpinner > div {
+        border-top-color: var(--primary) !important;
+    }
     
     /* ==================== SELECTBOX ==================== */
-    [data-baseweb="select"] {{
+    [data-baseweb="select"] {
         border-radius: 12px !important;
-    }}
+    }
     
     /* ==================== CHECKBOX & RADIO ==================== */
-    .stCheckbox, .stRadio {{
+    .stCheckbox, .stRadio {
         padding: 0.5rem 0;
-    }}
-    
-    /* ==================== FOOTER ==================== */
-    .premium-footer {{
-        background: linear-gradient(135deg, {COLORS['gray_900']} 0%, {COLORS['gray_800']} 100%);
-        color: {COLORS['white']};
-        padding: 2rem;
-        border-radius: 16px;
-        margin-top: 3rem;
-        text-align: center;
-    }}
-    
-    /* ==================== GLASSMORPHISM EFFECT ==================== */
-    .glass-card {{
-        background: rgba(255, 255, 255, 0.7);
-        backdrop-filter: blur(10px);
-        border-radius: 16px;
-        border: 1px solid rgba(255, 255, 255, 0.3);
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-    }}
+    }
     
     /* ==================== HIDE STREAMLIT BRANDING ==================== */
-    #MainMenu {{visibility: hidden;}}
-    footer {{visibility: hidden;}}
-    header {{visibility: hidden;}}
-    
-    </style>
-    """
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+    """)
+
+
+def build_premium_css():
+    """Build the minified premium stylesheet from the template and COLORS"""
+    return _minify_css(_CSS_TEMPLATE.substitute(COLORS))
+
+
+def _minify_css(css):
+    """Strip comments and collapse whitespace in a stylesheet"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.strip()
+
+
+def _load_premium_css():
+    """Read the generated stylesheet, building it if the file is missing"""
+    try:
+        css = PREMIUM_CSS_FILE.read_text(encoding="utf-8")
+    except OSError:
+        css = build_premium_css()
+    return f"{_FONT_LINKS}<style>{css}</style>"
+
+
+# Loaded once at import; every rerun reuses the same string
+_PREMIUM_CSS = _load_premium_css()
+
+
+def get_premium_css():
+    """Get comprehensive premium CSS styling"""
+    return _PREMIUM_CSS
 
 # =====================================================
 # PREMIUM COMPONENT FUNCTIONS
 # =====================================================
 
+# Metric colors with a .premium-metric-value--<color> rule; others fall back to primary
+_METRIC_COLORS = frozenset({'primary', 'success', 'warning', 'danger', 'info'})
+
+_ALERT_ICONS = {
+    'success': '✅',
+    'warning': '⚠️',
+    'danger': '🚨',
+    'info': 'ℹ️'
+}
+
+# Component HTML shells, filled with escaped values. Each is a single line
+# so fragments can be concatenated without Markdown reading indentation
+# as a code block.
+_HEADER_HTML = (
+    '<div class="premium-header animate-fadeInUp">'
+    '<h1>{icon} {title}</h1>'
+    '<p>{subtitle}</p>'
+    '</div>'
+)
+_METRIC_HTML = (
+    '<div class="premium-metric animate-fadeIn">'
+    '<div style="font-size: 2rem; margin-bottom: 0.5rem;">{icon}</div>'
+    '<div class="premium-metric-value premium-metric-value--{color}">{value}</div>'
+    '<div class="premium-metric-label">{label}</div>'
+    '</div>'
+)
+_ALERT_HTML = (
+    '<div class="premium-alert premium-alert-{alert_type} animate-fadeIn">'
+    '<strong>{icon} {message}</strong>'
+    '</div>'
+)
+_BADGE_HTML = '<span class="badge badge-{badge_type}">{text}</span>'
+
+
+# Rendered fragments per helper; the same labels and badges recur on every
+# rerun. typed=True keeps 1 and 1.0 (which hash equal) as separate entries.
+# The premium_*_html variants return the fragment so several can be shown
+# as one element with premium_section(). Components go out through st.html,
+# which skips Markdown parsing; the stylesheet stays on st.markdown because
+# st.html sanitizes away its <link> tags.
+_HTML_CACHE_SIZE = 512
+
+
+def _esc(value):
+    """HTML-escape a value for the component shells"""
+    return html.escape(str(value))
+
+@functools.lru_cache(maxsize=_HTML_CACHE_SIZE, typed=True)
+def premium_header_html(title, subtitle="", icon="🎓"):
+    """HTML for a premium header"""
+    return _HEADER_HTML.format(icon=_esc(icon), title=_esc(title), subtitle=_esc(subtitle))
+
 def premium_header(title, subtitle="", icon="🎓"):
     """Create a premium header"""
-    st.markdown(f"""
-        <div class="premium-header animate-fadeInUp">
-            <h1>{icon} {title}</h1>
-            <p>{subtitle}</p>
-        </div>
-    """, unsafe_allow_html=True)
+    st.html(premium_header_html(title, subtitle, icon))
+
+@functools.lru_cache(maxsize=_HTML_CACHE_SIZE, typed=True)
+def premium_metric_html(label, value, icon="📊", color="primary"):
+    """HTML for one premium metric card"""
+    if color not in _METRIC_COLORS:
+        color = 'primary'
+    
+    return _METRIC_HTML.format(icon=_esc(icon), color=color, value=_esc(value), label=_esc(label))
 
 def premium_metric(label, value, icon="📊", color="primary"):
     """Create a premium metric card"""
-    gradient_colors = {
-        'primary': f"linear-gradient(135deg, {COLORS['primary']} 0%, {COLORS['primary_light']} 100%)",
-        'success': f"linear-gradient(135deg, {COLORS['success']} 0%, #059669 100%)",
-        'warning': f"linear-gradient(135deg, {COLORS['warning']} 0%, #D97706 100%)",
-        'danger': f"linear-gradient(135deg, {COLORS['danger']} 0%, #991B1B 100%)",
-        'info': f"linear-gradient(135deg, {COLORS['info']} 0%, #2563EB 100%)",
-    }
-    
-    st.markdown(f"""
-        <div class="premium-metric animate-fadeIn">
-            <div style="font-size: 2rem; margin-bottom: 0.5rem;">{icon}</div>
-            <div class="premium-metric-value" style="background: {gradient_colors.get(color, gradient_colors['primary'])}; -webkit-background-clip: text; -webkit-text-fill-color: transparent;">
-                {value}
-            </div>
-            <div class="premium-metric-label">{label}</div>
-        </div>
-    """, unsafe_allow_html=True)
+    st.html(premium_metric_html(label, value, icon, color))
+
+@functools.lru_cache(maxsize=_HTML_CACHE_SIZE, typed=True)
+def premium_alert_html(message, alert_type="info", icon=None):
+    """HTML for a premium alert"""
+    # Built-in icons are markup-safe; only caller-supplied ones need escaping
+    display_icon = _esc(icon) if icon else _ALERT_ICONS.get(alert_type, _ALERT_ICONS['info'])
+    
+    return _ALERT_HTML.format(alert_type=_esc(alert_type), icon=display_icon, message=_esc(message))
 
 def premium_alert(message, alert_type="info", icon=None):
     """Create a premium alert"""
-    icons = {
-        'success': '✅',
-        'warning': '⚠️',
-        'danger': '🚨',
-        'info': 'ℹ️'
-    }
-    
-    display_icon = icon or icons.get(alert_type, 'ℹ️')
-    
-    st.markdown(f"""
-        <div class="premium-alert premium-alert-{alert_type} animate-fadeIn">
-            <strong>{display_icon} {message}</strong>
-        </div>
-    """, unsafe_allow_html=True)
+    st.html(premium_alert_html(message, alert_type, icon))
+
+@functools.lru_cache(maxsize=_HTML_CACHE_SIZE, typed=True)
+def _badge_html(text, badge_type="primary"):
+    """HTML for a premium badge"""
+    return _BADGE_HTML.format(badge_type=_esc(badge_type), text=_esc(text))
 
 def premium_badge(text, badge_type="primary"):
     """Create a premium badge"""
-    return f'<span class="badge badge-{badge_type}">{text}</span>'
+    return _badge_html(text, badge_type)
 
 def apply_premium_styling():
     """Apply all premium CSS styling"""
-    st.markdown(get_premium_css(), unsafe_allow_html=True)
+    # Must run on every rerun: Streamlit drops elements a rerun doesn't
+    # re-emit, so a once-per-session guard would unstyle the page after the
+    # first interaction. The string itself is shared by all sessions.
+    # It stays inline rather than a <link> to app/static/: Streamlit's static
+    # serving (1.37 is pinned) sends .css as text/plain with nosniff, which
+    # browsers refuse to apply as a stylesheet.
+    st.markdown(_PREMIUM_CSS, unsafe_allow_html=True)
 
 # =====================================================
 # PREMIUM LAYOUTS
@@ -602,15 +680,27 @@ def create_stat_cards(stats):
     Args:
         stats: List of dicts with 'label', 'value', 'icon', 'color'
     """
-    cols = st.columns(len(stats))
-    for col, stat in zip(cols, stats):
-        with col:
-            premium_metric(
-                stat.get('label', ''),
-                stat.get('value', 0),
-                stat.get('icon', '📊'),
-                stat.get('color', 'primary')
-            )
+    # One element for the whole row instead of st.columns + an element per card
+    cards = "".join(
+        premium_metric_html(
+            stat.get('label', ''),
+            stat.get('value', 0),
+            stat.get('icon', '📊'),
+            stat.get('color', 'primary')
+        )
+        for stat in stats
+    )
+    st.html(
+        f'<div class="premium-stat-grid" style="grid-template-columns: repeat({len(stats)}, 1fr);">{cards}</div>'
+    )
+
+def premium_section(*fragments):
+    """Show several premium_*_html fragments as a single element
+    
+    Args:
+        fragments: HTML strings, e.g. from premium_header_html or premium_badge
+    """
+    st.html("".join(fragments))
 
 def premium_success_message(message):
     """Show premium success message"""